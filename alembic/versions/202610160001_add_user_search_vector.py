@@ -0,0 +1,50 @@
+"""add a full-text search vector to users
+
+Revision ID: 202610160001
+Revises: 202502150001
+Create Date: 2026-10-16 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610160001"
+down_revision: Union[str, None] = "202502150001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(title, '')), 'B')
+    || setweight(to_tsvector('simple', coalesce(company, '')), 'B')
+    || setweight(to_tsvector('simple', coalesce(skills, '')), 'B')
+    || setweight(to_tsvector('simple', coalesce(interests, '')), 'C')
+    || setweight(to_tsvector('simple', coalesce(bio, '')), 'D')
+"""
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    # Other backends keep the LIKE-based search and need no column.
+    if not _is_postgresql():
+        return
+    op.execute(
+        "ALTER TABLE users ADD COLUMN search_tsv tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    op.execute(
+        "CREATE INDEX ix_users_search_tsv ON users USING GIN (search_tsv)"
+    )
+
+
+def downgrade() -> None:
+    if not _is_postgresql():
+        return
+    op.execute("DROP INDEX IF EXISTS ix_users_search_tsv")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS search_tsv")
@@ -0,0 +1,36 @@
+"""index user skills for containment filters
+
+Revision ID: 202610160002
+Revises: 202610160001
+Create Date: 2026-10-16 00:00:01
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610160002"
+down_revision: Union[str, None] = "202610160001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    # ``skills`` holds a JSON array; index it as jsonb for ``@>`` lookups.
+    if not _is_postgresql():
+        return
+    op.execute(
+        "CREATE INDEX ix_users_skills_gin ON users "
+        "USING GIN ((CAST(skills AS jsonb)))"
+    )
+
+
+def downgrade() -> None:
+    if not _is_postgresql():
+        return
+    op.execute("DROP INDEX IF EXISTS ix_users_skills_gin")
@@ -0,0 +1,36 @@
+"""cover the experience filter in the industry/location index
+
+Revision ID: 202610160003
+Revises: 202610160002
+Create Date: 2026-10-16 00:00:02
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610160003"
+down_revision: Union[str, None] = "202610160002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Listings filter on industry and location, then range-filter or sort
+    # on experience; the wider index serves the old prefix lookups too.
+    op.create_index(
+        "ix_users_industry_location_experience",
+        "users",
+        ["industry", "location", "experience_years"],
+    )
+    op.drop_index("ix_users_industry_location", table_name="users")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_users_industry_location",
+        "users",
+        ["industry", "location"],
+    )
+    op.drop_index("ix_users_industry_location_experience", table_name="users")
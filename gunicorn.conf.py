@@ -0,0 +1,16 @@
+"""Gunicorn settings for the user service.
+
+Every value can be overridden through the environment. The service is
+dominated by database and Redis round-trips, so setting
+``GUNICORN_WORKER_CLASS=gevent`` (with ``gevent`` installed) lets each worker
+serve many requests while others wait on I/O. The gevent worker monkey
+patches the standard library itself before the application is loaded.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('APP_PORT', '8080')}"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
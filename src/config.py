@@ -6,7 +6,7 @@ import os
 
 from dataclasses import dataclass, field
 from functools import cached_property, lru_cache
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 from dotenv import load_dotenv
 from redis import Redis
@@ -56,7 +56,9 @@ class Config:
     sqlalchemy_echo: bool = False
     flask_secret: str = "dev"
     cors_origins: List[str] = field(default_factory=lambda: ["*"])
+    allowed_redirects: FrozenSet[str] = frozenset()
     redis_cache_ttl: int = 300
+    redis_cache_stale_ttl: int = 60
     jwt_secret: str = "change_me"
     jwt_algorithm: str = "HS256"
     jwt_ttl_minutes: int = 60
@@ -68,6 +70,9 @@ class Config:
     database_backup_url: Optional[str] = None
     database_restore_url: Optional[str] = None
     database_ssl_mode: Optional[str] = None
+    audit_async: bool = False
+    audit_batch_size: int = 100
+    audit_flush_interval_ms: int = 250
 
     @cached_property
     def redis(self) -> Optional[Redis]:
@@ -94,7 +99,13 @@ def get_config() -> Config:
         sqlalchemy_echo=_parse_bool(os.getenv("SQLALCHEMY_ECHO")),
         flask_secret=os.getenv("FLASK_SECRET", "dev"),
         cors_origins=_parse_origins(os.getenv("CORS_ORIGINS")),
+        allowed_redirects=frozenset(
+            _parse_list(os.getenv("ALLOWED_REDIRECTS"))
+        ),
         redis_cache_ttl=_parse_int(os.getenv("REDIS_CACHE_TTL"), 300),
+        redis_cache_stale_ttl=_parse_int(
+            os.getenv("REDIS_CACHE_STALE_TTL"), 60
+        ),
         jwt_secret=os.getenv("JWT_SECRET", "change_me"),
         jwt_algorithm=os.getenv("JWT_ALGO", "HS256"),
         jwt_ttl_minutes=_parse_int(os.getenv("JWT_TTL_MIN"), 60),
@@ -112,6 +123,11 @@ def get_config() -> Config:
         database_backup_url=os.getenv("DATABASE_BACKUP_URL"),
         database_restore_url=os.getenv("DATABASE_RESTORE_URL"),
         database_ssl_mode=os.getenv("DATABASE_SSL_MODE"),
+        audit_async=_parse_bool(os.getenv("AUDIT_ASYNC")),
+        audit_batch_size=_parse_int(os.getenv("AUDIT_BATCH_SIZE"), 100),
+        audit_flush_interval_ms=_parse_int(
+            os.getenv("AUDIT_FLUSH_INTERVAL_MS"), 250
+        ),
     )
 
 
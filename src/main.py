@@ -5,15 +5,16 @@ import os
 import time
 from datetime import datetime, timezone
 
-from flask import Flask, Response, g, jsonify, request
+from flask import Flask, Response, g, request
 from flask_cors import CORS
 from werkzeug.exceptions import HTTPException
 
 from src.auth.oauth import init_oauth
 from src.config import Config, get_config
 from src.routes.auth import auth_bp
-from src.routes.helpers import error_response
+from src.routes.helpers import error_response, json_response
 from src.routes.users import users_bp
+from src.services.audit import AuditEventQueue
 from src.services.cache import CacheService
 from src.utils.encryption import ApplicationEncryptor
 
@@ -36,6 +37,23 @@ REQUEST_LATENCY = Histogram(
     labelnames=("method", "endpoint"),
 )
 
+_health_stamp: tuple[int, str] = (-1, "")
+
+
+def _health_timestamp() -> str:
+    """Return the current UTC time in ISO format, to the second.
+
+    The string is rebuilt only when the second changes, not per request.
+    """
+
+    global _health_stamp
+    second = int(time.time())
+    cached_second, stamp = _health_stamp
+    if second != cached_second:
+        stamp = datetime.fromtimestamp(second, timezone.utc).isoformat()
+        _health_stamp = (second, stamp)
+    return stamp
+
 
 def create_app(config: Config | None = None) -> Flask:
     """Create and configure the Flask application.
@@ -60,12 +78,18 @@ def create_app(config: Config | None = None) -> Flask:
     app.extensions["cache_service"] = CacheService(
         app.extensions.get("redis_client"),
         config.redis_cache_ttl,
+        stale_ttl=config.redis_cache_stale_ttl,
     )
     app.extensions["encryptor"] = ApplicationEncryptor.from_keys(
         primary_key=config.encryption_primary_key,
         fallback_keys=config.encryption_fallback_keys,
         rotation_days=config.encryption_rotation_days,
     )
+    if config.audit_async:
+        app.extensions["audit_queue"] = AuditEventQueue(
+            batch_size=config.audit_batch_size,
+            flush_interval=config.audit_flush_interval_ms / 1000,
+        )
     init_oauth(app)
 
     @app.errorhandler(HTTPException)
@@ -82,11 +106,11 @@ def create_app(config: Config | None = None) -> Flask:
     @app.route("/health")
     def health():
         """Health check endpoint."""
-        return jsonify(
+        return json_response(
             {
                 "status": "ok",
                 "service": "user-service",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": _health_timestamp(),
             }
         )
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable, TypeVar
 
 from flask import current_app, has_app_context
 
@@ -22,6 +22,8 @@ from .verifications import UserVerificationRepository
 if TYPE_CHECKING:  # pragma: no cover - typing helper
     from src.services.cache import CacheHooks
 
+T = TypeVar("T")
+
 
 class UserRepository:
     """Facade exposing all user related repository methods."""
@@ -46,25 +48,27 @@ class UserRepository:
                     )
         self.session = session
         self._encryptor = encryptor
-        self._repositories: Iterable[object] = (
-            UserCoreRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            ),
-            UserPreferenceRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            ),
-            UserActivityRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            ),
-            UserConnectionRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            ),
-            UserSessionRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            ),
-            UserVerificationRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            ),
+        self._cache_hooks = cache_hooks
+        self._components: dict[type, object] = {}
+
+    def _component(self, repository_cls: type[T]) -> T:
+        """Return the ``repository_cls`` component, built on first use."""
+
+        component = self._components.get(repository_cls)
+        if component is None:
+            component = repository_cls(
+                self.session,
+                cache_hooks=self._cache_hooks,
+                encryptor=self._encryptor,
+            )
+            self._components[repository_cls] = component
+        return component
+
+    @property
+    def _repositories(self) -> Iterable[object]:
+        return tuple(
+            self._component(repository_cls)
+            for repository_cls in _DELEGATED_REPOSITORIES
         )
 
     def __getattr__(self, name: str) -> Any:
@@ -82,8 +86,12 @@ class UserRepository:
         return sorted(names)
 
 
-def _make_delegate(name: str) -> Callable[..., Any]:
+def _make_delegate(
+    name: str, owner: type | None = None
+) -> Callable[..., Any]:
     def _delegate(self: UserRepository, *args: Any, **kwargs: Any) -> Any:
+        if owner is not None:
+            return getattr(self._component(owner), name)(*args, **kwargs)
         for repository in self._repositories:
             if hasattr(repository, name):
                 return getattr(repository, name)(*args, **kwargs)
@@ -102,15 +110,28 @@ _DELEGATED_REPOSITORIES = (
     UserVerificationRepository,
 )
 
-for _repository in _DELEGATED_REPOSITORIES:
-    for _attr_name, _attr in _repository.__dict__.items():
-        if _attr_name.startswith("_"):
-            continue
-        if not callable(_attr):
-            continue
-        if hasattr(UserRepository, _attr_name):
-            continue
-        setattr(UserRepository, _attr_name, _make_delegate(_attr_name))
+
+def _register_delegates(
+    target: type, repositories: Iterable[type]
+) -> None:
+    """Expose the public methods of ``repositories`` on ``target``.
+
+    Names ``target`` already defines, including methods registered from an
+    earlier repository, are left alone.
+    """
+
+    for repository in repositories:
+        for name, attr in repository.__dict__.items():
+            if name.startswith("_"):
+                continue
+            if not callable(attr):
+                continue
+            if hasattr(target, name):
+                continue
+            setattr(target, name, _make_delegate(name, repository))
+
+
+_register_delegates(UserRepository, _DELEGATED_REPOSITORIES)
 
 
 __all__ = [
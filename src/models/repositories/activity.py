@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import case, select, update
 
 from src.models.user import User, UserActivity
 
@@ -37,20 +37,64 @@ class UserActivityRepository(SQLAlchemyRepository):
         self._invalidate_profile_cache(user.id)
         return entry
 
+    @repository_method
+    def record_activity_by_id(
+        self,
+        user_id: int,
+        *,
+        activity_type: str,
+        description: Optional[str] = None,
+        score_delta: int = 0,
+    ) -> Optional[UserActivity]:
+        """Record an activity without loading the user.
+
+        The score moves in a single ``UPDATE``, so concurrent activities
+        cannot overwrite each other's delta. Returns ``None`` when no user
+        matches ``user_id``.
+        """
+
+        if score_delta:
+            new_score = User.engagement_score + score_delta
+            stmt = (
+                update(User)
+                .where(User.id == user_id)
+                .values(
+                    engagement_score=case((new_score < 0, 0), else_=new_score)
+                )
+                .returning(User.id)
+            )
+            found = self.session.execute(stmt).scalar_one_or_none()
+        else:
+            found = self.session.scalar(
+                select(User.id).where(User.id == user_id)
+            )
+        if found is None:
+            return None
+        entry = UserActivity(
+            user_id=user_id,
+            activity_type=activity_type,
+            description=description,
+            score_delta=score_delta,
+        )
+        self.session.add(entry)
+        self._flush()
+        self._invalidate_profile_cache(user_id)
+        return entry
+
     @repository_method
     def list_activities(
         self,
-        user: User,
+        user_id: int,
         *,
         limit: int = 50,
-    ) -> list[UserActivity]:
+        offset: int = 0,
+    ) -> tuple[list[UserActivity], int]:
         stmt = (
             select(UserActivity)
-            .where(UserActivity.user_id == user.id)
+            .where(UserActivity.user_id == user_id)
             .order_by(UserActivity.created_at.desc(), UserActivity.id.desc())
-            .limit(limit)
         )
-        return self.session.execute(stmt).scalars().all()
+        return self._fetch_page(stmt, limit=limit, offset=offset)
 
 
 __all__ = ["UserActivityRepository"]
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, Mapping, Optional, Sequence
+
+from sqlalchemy import insert
 
 from src.models.audit import AuditLog
 
@@ -35,5 +37,12 @@ class AuditLogRepository(SQLAlchemyRepository):
         self._flush()
         return entry
 
+    @repository_method
+    def record_events(self, payloads: Sequence[Mapping[str, Any]]) -> None:
+        """Insert several entries with one executemany ``INSERT``."""
+
+        if payloads:
+            self.session.execute(insert(AuditLog), list(payloads))
+
 
 __all__ = ["AuditLogRepository"]
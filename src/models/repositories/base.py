@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from functools import wraps
 from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
 
+from sqlalchemy import Select, func, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -79,6 +80,27 @@ class SQLAlchemyRepository:
             self._handle_error(exc)
             raise RepositoryError("database operation failed") from exc
 
+    def _fetch_page(
+        self, stmt: Select, *, limit: int, offset: int = 0
+    ) -> tuple[list[Any], int]:
+        """Return a page of ``stmt`` entities and the total matching rows.
+
+        The total is read from ``COUNT(*) OVER ()`` on the page query
+        itself; only a page past the end needs a separate count.
+        """
+
+        rows = self.session.execute(
+            stmt.add_columns(func.count().over()).limit(limit).offset(offset)
+        ).all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+        if not offset:
+            return [], 0
+        count_stmt = select(func.count()).select_from(
+            stmt.order_by(None).subquery()
+        )
+        return [], self.session.execute(count_stmt).scalar_one()
+
     # ------------------------------------------------------------------
     # Cache invalidation helpers
     # ------------------------------------------------------------------
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import Optional
 
 from sqlalchemy import select
+from sqlalchemy.orm import lazyload
 
 from src.models.user import User, UserConnection
 
@@ -63,18 +64,26 @@ class UserConnectionRepository(SQLAlchemyRepository):
     @repository_method
     def list_connections(
         self,
-        user: User,
+        user_id: int,
         *,
         status: Optional[str] = None,
-    ) -> list[UserConnection]:
-        stmt = select(UserConnection).where(UserConnection.user_id == user.id)
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[UserConnection], int]:
+        # Listings expose ``target_user_id`` only; loading the target would
+        # also pull in every eager collection of that user.
+        stmt = (
+            select(UserConnection)
+            .where(UserConnection.user_id == user_id)
+            .options(lazyload(UserConnection.target_user))
+        )
         if status:
             stmt = stmt.where(UserConnection.status == status)
         stmt = stmt.order_by(
             UserConnection.updated_at.desc(),
             UserConnection.id.desc(),
         )
-        return self.session.execute(stmt).scalars().all()
+        return self._fetch_page(stmt, limit=limit, offset=offset)
 
     @repository_method
     def get_connection_by_id(
@@ -43,13 +43,19 @@ class UserSessionRepository(SQLAlchemyRepository):
         return record
 
     @repository_method
-    def list_sessions(self, user: User) -> list[UserSession]:
+    def list_sessions(
+        self,
+        user_id: int,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[UserSession], int]:
         stmt = (
             select(UserSession)
-            .where(UserSession.user_id == user.id)
+            .where(UserSession.user_id == user_id)
             .order_by(UserSession.created_at.desc(), UserSession.id.desc())
         )
-        return self.session.execute(stmt).scalars().all()
+        return self._fetch_page(stmt, limit=limit, offset=offset)
 
     @repository_method
     def get_session_by_id(self, session_id: int) -> Optional[UserSession]:
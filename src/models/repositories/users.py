@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Iterable, Optional, Sequence, Tuple
+from typing import Iterable, NamedTuple, Optional, Sequence, Tuple
 
+import json
 import secrets
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import and_, cast, func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import lazyload, selectinload
 
 from src.models.user import (
     User,
@@ -27,6 +30,90 @@ SORT_FIELDS = {
 }
 
 
+# Generated, GIN-indexed column added by the PostgreSQL search migration.
+SEARCH_VECTOR = literal_column("users.search_tsv")
+
+
+def search_clause(query: str, dialect: str):
+    """Return the free-text predicate for ``query`` on ``dialect``.
+
+    PostgreSQL matches words against the indexed ``search_tsv`` vector;
+    other backends fall back to substring matches on each text column.
+    """
+
+    if dialect == "postgresql":
+        return SEARCH_VECTOR.op("@@")(func.plainto_tsquery("simple", query))
+    pattern = f"%{query.lower()}%"
+    return or_(
+        func.lower(User.name).like(pattern),
+        func.lower(User.title).like(pattern),
+        func.lower(User.company).like(pattern),
+        func.lower(User.bio).like(pattern),
+        func.lower(func.coalesce(User.skills, "")).like(pattern),
+        func.lower(func.coalesce(User.interests, "")).like(pattern),
+    )
+
+
+def skills_clause(skills: Sequence[str], dialect: str):
+    """Return the predicate requiring every skill in ``skills``.
+
+    ``users.skills`` stores a JSON array. PostgreSQL tests containment on
+    the GIN-indexed ``skills::jsonb`` expression in one predicate; other
+    backends match each quoted item in the raw text.
+    """
+
+    if dialect == "postgresql":
+        return cast(User.skills, JSONB).op("@>")(
+            cast(json.dumps(list(skills)), JSONB)
+        )
+    return and_(*(User.skills.contains(f'"{skill}"') for skill in skills))
+
+
+class UserPage(NamedTuple):
+    """A page of users; ``total`` is ``None`` when it was not counted."""
+
+    items: list[User]
+    total: int | None
+    has_next: bool
+
+
+PAGE_RELATION_LOADS = (
+    selectinload(User.preferences),
+    selectinload(User.social_accounts),
+)
+
+UPDATABLE_FIELDS = (
+    "name",
+    "title",
+    "company",
+    "location",
+    "industry",
+    "linkedin_url",
+    "experience_years",
+    "bio",
+    "timezone",
+    "is_active",
+    "engagement_score",
+    "reputation_score",
+)
+# Updatable columns that listings and searches show, filter, or match on;
+# writes touching only other columns leave summary collections valid.
+COLLECTION_COLUMNS = frozenset(
+    {
+        "name",
+        "title",
+        "company",
+        "location",
+        "industry",
+        "experience_years",
+        "bio",
+        "is_active",
+        "skills",
+        "interests",
+    }
+)
+
+
 class UserCoreRepository(SQLAlchemyRepository):
     """Core operations for the ``User`` entity."""
 
@@ -34,6 +121,13 @@ class UserCoreRepository(SQLAlchemyRepository):
     def get(self, user_id: int) -> Optional[User]:
         return self.session.get(User, user_id)
 
+    @repository_method
+    def exists(self, user_id: int) -> bool:
+        """Return whether ``user_id`` exists without loading the user."""
+
+        stmt = select(User.id).where(User.id == user_id)
+        return self.session.execute(stmt).first() is not None
+
     @repository_method
     def get_by_email(self, email: str) -> Optional[User]:
         normalized = normalize_email(email)
@@ -135,43 +229,62 @@ class UserCoreRepository(SQLAlchemyRepository):
 
     @repository_method
     def update_user(self, user: User, data: dict[str, object]) -> User:
-        mapping = {
-            "name": "name",
-            "title": "title",
-            "company": "company",
-            "location": "location",
-            "industry": "industry",
-            "linkedin_url": "linkedin_url",
-            "experience_years": "experience_years",
-            "bio": "bio",
-            "timezone": "timezone",
-            "is_active": "is_active",
-            "engagement_score": "engagement_score",
-            "reputation_score": "reputation_score",
-        }
-        for field, attr in mapping.items():
-            if field in data:
-                setattr(user, attr, data[field])
+        values = self._update_values(data)
+        for attr, value in values.items():
+            setattr(user, attr, value)
+
+        self._flush()
+        self._invalidate_profile_cache(user.id)
+        if values.keys() & COLLECTION_COLUMNS:
+            self._invalidate_listing_cache()
+        return user
 
+    @repository_method
+    def update_user_by_id(
+        self, user_id: int, data: dict[str, object]
+    ) -> Optional[User]:
+        """Apply ``data`` with a single ``UPDATE ... RETURNING`` statement.
+
+        Returns ``None`` when no user matches ``user_id``.
+        """
+
+        values = self._update_values(data)
+        if not values:
+            return self.get(user_id)
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**values)
+            .returning(User)
+        )
+        user = self.session.execute(stmt).unique().scalar_one_or_none()
+        if user is not None:
+            self._invalidate_profile_cache(user.id)
+            if values.keys() & COLLECTION_COLUMNS:
+                self._invalidate_listing_cache()
+        return user
+
+    def _update_values(self, data: dict[str, object]) -> dict[str, object]:
+        """Map an update payload onto ``User`` column values."""
+
+        values = {
+            field: data[field] for field in UPDATABLE_FIELDS if field in data
+        }
         if "skills" in data:
-            user.skills = encode_string_list(data.get("skills"))
+            values["skills"] = encode_string_list(data.get("skills"))
         if "interests" in data:
-            user.interests = encode_string_list(data.get("interests"))
+            values["interests"] = encode_string_list(data.get("interests"))
         if "privacy_settings" in data and data["privacy_settings"] is not None:
-            user.privacy_settings = dict(data["privacy_settings"])
+            values["privacy_settings"] = dict(data["privacy_settings"])
         if "active_tokens" in data and data["active_tokens"] is not None:
             tokens = normalize_tokens(data["active_tokens"])
             if self._encryptor:
-                user.active_tokens = [
+                values["active_tokens"] = [
                     self._encryptor.hash_token(token) for token in tokens
                 ]
             else:
-                user.active_tokens = tokens
-
-        self._flush()
-        self._invalidate_profile_cache(user.id)
-        self._invalidate_listing_cache()
-        return user
+                values["active_tokens"] = tokens
+        return values
 
     @repository_method
     def delete_user(self, user: User) -> None:
@@ -185,8 +298,25 @@ class UserCoreRepository(SQLAlchemyRepository):
         user.photo_url = photo_url
         self._flush()
         self._invalidate_profile_cache(user.id)
+        self._invalidate_listing_cache()
         return user
 
+    @repository_method
+    def set_photo_url_by_id(self, user_id: int, photo_url: str) -> bool:
+        """Set the photo URL in one statement; ``False`` if no user."""
+
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(photo_url=photo_url)
+            .returning(User.id)
+        )
+        if self.session.execute(stmt).scalar_one_or_none() is None:
+            return False
+        self._invalidate_profile_cache(user_id)
+        self._invalidate_listing_cache()
+        return True
+
     @repository_method
     def deactivate(self, user: User) -> None:
         user.is_active = False
@@ -389,11 +519,20 @@ class UserCoreRepository(SQLAlchemyRepository):
         per_page: int,
         sort: Tuple[str, str],
         filters: dict[str, object],
-    ) -> Tuple[list[User], int]:
+        include_relations: bool = True,
+        exact_total: bool = True,
+    ) -> UserPage:
         stmt = select(User)
         stmt = stmt.where(User.is_active.is_(True))
         stmt = self._apply_filters(stmt, filters)
-        return self._paginate(stmt, page, per_page, sort)
+        return self._paginate(
+            stmt,
+            page,
+            per_page,
+            sort,
+            include_relations=include_relations,
+            exact_total=exact_total,
+        )
 
     @repository_method
     def search_users(
@@ -404,21 +543,21 @@ class UserCoreRepository(SQLAlchemyRepository):
         per_page: int,
         sort: Tuple[str, str],
         filters: dict[str, object],
-    ) -> Tuple[list[User], int]:
+        include_relations: bool = True,
+        exact_total: bool = True,
+    ) -> UserPage:
         stmt = select(User).where(User.is_active.is_(True))
         stmt = self._apply_filters(stmt, filters)
-        pattern = f"%{query.lower()}%"
-        stmt = stmt.where(
-            or_(
-                func.lower(User.name).like(pattern),
-                func.lower(User.title).like(pattern),
-                func.lower(User.company).like(pattern),
-                func.lower(User.bio).like(pattern),
-                func.lower(func.coalesce(User.skills, "")).like(pattern),
-                func.lower(func.coalesce(User.interests, "")).like(pattern),
-            )
+        dialect = self.session.get_bind().dialect.name
+        stmt = stmt.where(search_clause(query, dialect))
+        return self._paginate(
+            stmt,
+            page,
+            per_page,
+            sort,
+            include_relations=include_relations,
+            exact_total=exact_total,
         )
-        return self._paginate(stmt, page, per_page, sort)
 
     # ------------------------------------------------------------------
     # Helpers
@@ -433,9 +572,9 @@ class UserCoreRepository(SQLAlchemyRepository):
         if (max_exp := filters.get("max_experience")) is not None:
             stmt = stmt.where(User.experience_years <= int(max_exp))
         skills = filters.get("skills")
-        if isinstance(skills, Sequence):
-            for skill in skills:
-                stmt = stmt.where(User.skills.contains(f'"{skill}"'))
+        if isinstance(skills, Sequence) and skills:
+            dialect = self.session.get_bind().dialect.name
+            stmt = stmt.where(skills_clause(skills, dialect))
         return stmt
 
     def _paginate(
@@ -444,24 +583,42 @@ class UserCoreRepository(SQLAlchemyRepository):
         page: int,
         per_page: int,
         sort: Tuple[str, str],
-    ) -> Tuple[list[User], int]:
+        *,
+        include_relations: bool = True,
+        exact_total: bool = True,
+    ) -> UserPage:
+        """Fetch one page of ``stmt``.
+
+        With ``exact_total`` the total comes from a window count on the
+        page query itself; otherwise one extra row is fetched to tell
+        whether a next page exists and no count is run at all.
+        """
+
         sort_field, direction = sort
         column = SORT_FIELDS.get(sort_field, User.created_at)
         order_clause = column.desc() if direction == "desc" else column.asc()
+        # Joined eager loads would wrap the LIMIT query in a subquery and
+        # repeat user rows; load collections per page with IN queries
+        # instead, or skip them when the caller only needs columns.
+        ordered = stmt.order_by(order_clause, User.id.asc()).options(
+            *(PAGE_RELATION_LOADS if include_relations else (lazyload("*"),))
+        )
+        offset = (page - 1) * per_page
 
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = self.session.execute(count_stmt).scalar_one()
-        if total == 0:
-            return [], 0
+        if exact_total:
+            records, total = self._fetch_page(
+                ordered, limit=per_page, offset=offset
+            )
+            return UserPage(records, total, offset + len(records) < total)
 
-        offset = (page - 1) * per_page
-        result_stmt = (
-            stmt.order_by(order_clause, User.id.asc())
-            .offset(offset)
-            .limit(per_page)
+        records = (
+            self.session.execute(ordered.offset(offset).limit(per_page + 1))
+            .scalars()
+            .all()
+        )
+        return UserPage(
+            list(records[:per_page]), None, len(records) > per_page
         )
-        records = self.session.execute(result_stmt).scalars().unique().all()
-        return records, total
 
 
 def normalize_email(email: str) -> str:
@@ -514,4 +671,7 @@ __all__ = [
     "normalize_tokens",
     "sync_social_account",
     "SORT_FIELDS",
+    "UserPage",
+    "search_clause",
+    "skills_clause",
 ]
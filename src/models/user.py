@@ -27,7 +27,12 @@ class User(Base):
 
     __tablename__ = "users"
     __table_args__ = (
-        Index("ix_users_industry_location", "industry", "location"),
+        Index(
+            "ix_users_industry_location_experience",
+            "industry",
+            "location",
+            "experience_years",
+        ),
         Index("ix_users_created_at", "created_at"),
         Index("ix_users_updated_at", "updated_at"),
         Index("ix_users_last_login", "last_login"),
@@ -5,7 +5,7 @@ import os
 from datetime import datetime, timezone
 from typing import Any, Dict
 
-from flask import Blueprint, current_app, jsonify, request, session
+from flask import Blueprint, current_app, request, session
 
 from src.auth.jwt_handler import decode_jwt, encode_jwt, require_auth
 from src.auth.oauth import (
@@ -15,20 +15,24 @@ from src.auth.oauth import (
     generate_state,
 )
 from src.models.repositories import RepositoryError, UserRepository
-from src.routes.helpers import error_response, repository_error_response
+from src.routes.helpers import (
+    error_response,
+    json_response,
+    repository_error_response,
+)
 from src.schemas.user import UserSchema, UserVerificationSchema
 from src.services.audit import log_audit_event
 from src.services.transactions import transactional_session
+from src.utils.dates import parse_iso_datetime
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 user_schema = UserSchema()
 verification_schema = UserVerificationSchema()
 
-ALLOWED_REDIRECTS = {
-    value.strip()
-    for value in os.getenv("ALLOWED_REDIRECTS", "").split(",")
-    if value.strip()
-}
+
+def _allowed_redirects() -> frozenset[str]:
+    config = current_app.config.get("APP_CONFIG")
+    return getattr(config, "allowed_redirects", frozenset())
 
 
 @auth_bp.post("/<provider>")
@@ -54,7 +58,7 @@ def auth_start(provider: str):
     redirect_uri = requested_redirect or default_redirect_uri
     if requested_redirect:
         if (
-            requested_redirect not in ALLOWED_REDIRECTS
+            requested_redirect not in _allowed_redirects()
             and requested_redirect != default_redirect_uri
         ):
             return error_response(400, "invalid redirect")
@@ -72,7 +76,7 @@ def auth_start(provider: str):
         actor=provider,
         details={"redirect_uri": redirect_uri, "state": state},
     )
-    return jsonify({"auth_url": url})
+    return json_response({"auth_url": url})
 
 
 @auth_bp.get("/<provider>/callback")
@@ -187,7 +191,7 @@ def auth_callback(provider: str):
                 profile,
             )
         token = encode_jwt(user)
-        return jsonify({"token": token, "user": profile})
+        return json_response({"token": token, "user": profile})
     finally:
         session.pop("state", None)
         session.pop("nonce", None)
@@ -224,7 +228,7 @@ def verify():
         actor=payload.get("email"),
         details={"exp": payload.get("exp")},
     )
-    return jsonify(
+    return json_response(
         {"valid": True, "sub": payload["sub"], "exp": payload["exp"]}
     )
 
@@ -249,7 +253,7 @@ def request_verification():
     expires_at = None
     if expires_at_raw is not None:
         try:
-            expires_at = _parse_iso_datetime(str(expires_at_raw))
+            expires_at = parse_iso_datetime(str(expires_at_raw))
         except ValueError as exc:
             return error_response(422, str(exc))
 
@@ -292,7 +296,7 @@ def request_verification():
     except RepositoryError as exc:
         return repository_error_response(exc)
 
-    return jsonify({"verification": data}), 201
+    return json_response({"verification": data}, 201)
 
 
 @auth_bp.post("/verification/confirm")
@@ -339,7 +343,7 @@ def confirm_verification():
         return repository_error_response(exc)
 
     status = 200 if success else 422
-    return jsonify({"success": success, "verification": data}), status
+    return json_response({"success": success, "verification": data}, status)
 
 
 @auth_bp.get("/profile")
@@ -357,7 +361,7 @@ def profile():
         cache_key = cache_service.profile_key(user_id)
         cached = cache_service.get_json(cache_key)
         if cached is not None:
-            return jsonify({"user": cached})
+            return json_response({"user": cached})
 
     try:
         with transactional_session(name="auth.profile") as db_session:
@@ -378,18 +382,10 @@ def profile():
     if cache_service and cache_key:
         cache_service.set_json(cache_key, profile)
 
-    return jsonify({"user": profile})
+    return json_response({"user": profile})
 
 
 def _serialize_user(user) -> Dict[str, Any]:
     """Serialize a user object for JSON responses/caching."""
 
     return user_schema.dump(user)
-
-
-def _parse_iso_datetime(value: str) -> datetime:
-    try:
-        return datetime.fromisoformat(value)
-    except ValueError as exc:
-        # pragma: no cover - fallback for unsupported formats
-        raise ValueError("invalid datetime format") from exc
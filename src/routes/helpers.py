@@ -4,11 +4,53 @@ from __future__ import annotations
 
 from typing import Any
 
-from flask import current_app, jsonify
+from flask import Response, current_app, request
+from orjson import OPT_NON_STR_KEYS, dumps as _dumps, loads as _loads
 
 from src.models.repositories import RepositoryError
 
 
+def json_response(payload: Any, status_code: int = 200) -> Response:
+    """Encode an already-serialized payload straight into a response.
+
+    Unlike ``jsonify`` this skips Flask's JSON provider and key sorting, so
+    ``payload`` must already hold JSON-native values such as schema dumps.
+    Non-string keys, like the item indexes in Marshmallow list errors, are
+    written as strings.
+    """
+
+    body = _dumps(payload, option=OPT_NON_STR_KEYS)
+    return Response(body, status=status_code, mimetype="application/json")
+
+
+def conditional_json_response(payload: Any) -> Response:
+    """Return ``payload`` with an ETag, answering 304 when it matches.
+
+    The tag is a digest of the encoded body. Row timestamps only have
+    second resolution and do not cover embedded relations, so they cannot
+    stand in for it.
+    """
+
+    response = json_response(payload)
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def read_json_body() -> Any | None:
+    """Decode the JSON request body, or return ``None`` if it is invalid.
+
+    Mirrors ``request.get_json(silent=True)`` but reads the raw body
+    without caching it on the request.
+    """
+
+    if not request.is_json:
+        return None
+    try:
+        return _loads(request.get_data(cache=False))
+    except ValueError:
+        return None
+
+
 def error_response(
     status_code: int,
     message: str,
@@ -23,7 +65,7 @@ def error_response(
             "details": details or {},
         }
     }
-    return jsonify(payload), status_code
+    return json_response(payload, status_code)
 
 
 def repository_error_response(error: RepositoryError):
@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+import re
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Mapping, Tuple, TypeVar
+from functools import lru_cache
+from typing import Callable, Iterator, Mapping, Tuple, TypeVar
 
-from flask import Blueprint, Response, current_app, jsonify, request
+from flask import Blueprint, Response, current_app, g, request
 from marshmallow import ValidationError
+from sqlalchemy.orm import Session
 
 from src.models.repositories import RepositoryError, UserRepository
-from src.routes.helpers import error_response, repository_error_response
+from src.routes.helpers import (
+    conditional_json_response,
+    error_response,
+    json_response,
+    read_json_body,
+    repository_error_response,
+)
+from src.schemas.fast import compile_dumper, compile_loader
 from src.schemas.user import (
     UserActivitySchema,
     UserConnectionSchema,
@@ -19,15 +30,44 @@ from src.schemas.user import (
     UserUpdateSchema,
 )
 from src.services.audit import log_audit_event
-from src.services.uploads import UploadError, save_user_photo
+from src.services.cache import (
+    DETAIL_TAG,
+    LISTING_TAG,
+    SEARCH_TAG,
+    CacheService,
+)
+from src.services.uploads import (
+    MAX_REQUEST_SIZE,
+    UploadError,
+    remove_user_photo,
+    save_user_photo,
+)
 from src.services.transactions import transactional_session
-from src.utils.lists import normalize_string_list
+from src.utils.dates import parse_iso_datetime
+from src.utils.lists import split_string_list
 
 users_bp = Blueprint("users", __name__, url_prefix="/users")
 
 user_schema = UserSchema()
 users_schema = UserSchema(many=True)
+# Listings return this summary unless ``?fields=full`` is requested.
+LISTING_FIELDS = (
+    "id",
+    "email",
+    "name",
+    "photo_url",
+    "title",
+    "company",
+    "location",
+    "industry",
+    "experience_years",
+    "skills",
+    "interests",
+)
+listing_users_schema = UserSchema(many=True, only=LISTING_FIELDS)
+privacy_schema = UserSchema(only=("id", "privacy_settings", "active_tokens"))
 update_schema = UserUpdateSchema()
+load_update = compile_loader(update_schema)
 activity_schema = UserActivitySchema()
 activities_schema = UserActivitySchema(many=True)
 session_schema = UserSessionSchema()
@@ -35,33 +75,109 @@ sessions_schema = UserSessionSchema(many=True)
 connection_schema = UserConnectionSchema()
 connections_schema = UserConnectionSchema(many=True)
 verification_schema = UserVerificationSchema()
+dump_users = compile_dumper(users_schema)
+dump_listing_users = compile_dumper(listing_users_schema)
+dump_activities = compile_dumper(activities_schema)
+dump_sessions = compile_dumper(sessions_schema)
+dump_connections = compile_dumper(connections_schema)
 
 DEFAULT_SORT = ("created_at", "desc")
-ALLOWED_SORT_FIELDS = {
-    "created_at",
-    "updated_at",
-    "last_login",
-    "experience_years",
-    "name",
-}
+ALLOWED_SORT_FIELDS = frozenset(
+    {
+        "created_at",
+        "updated_at",
+        "last_login",
+        "experience_years",
+        "name",
+    }
+)
+STRING_FILTER_KEYS = ("industry", "location")
+COUNT_MODES = frozenset({"exact", "none"})
+# Canonical spellings of every in-range page size, resolved without int().
+_SMALL_INTS = {str(number): number for number in range(201)}
+# Characters no profile field can match on; they are dropped from queries.
+SEARCH_QUERY_DISALLOWED = re.compile(r"[^\w\s\-'.+#@&/]+")
+SEARCH_QUERY_MIN_LENGTH = 2
+SEARCH_QUERY_MAX_LENGTH = 64
 
 
 T = TypeVar("T")
 
 
+def _cache_service() -> CacheService | None:
+    """Return the application cache service, memoized for the request."""
+
+    if "_cache_service" not in g:
+        g._cache_service = current_app.extensions.get("cache_service")
+    return g._cache_service
+
+
+@contextmanager
+def _user_repo(
+    transaction_name: str,
+) -> Iterator[tuple[Session, UserRepository]]:
+    """Open a transaction and yield it with a configured repository.
+
+    Cache invalidations raised by the repository are applied only after
+    the transaction commits.
+    """
+
+    cache_service = _cache_service()
+    pending = cache_service.pending_invalidations() if cache_service else None
+    with transactional_session(name=transaction_name) as session:
+        repository = UserRepository(
+            session,
+            cache_hooks=pending.hooks if pending else None,
+            encryptor=current_app.extensions.get("encryptor"),
+        )
+        yield session, repository
+    if pending:
+        pending.flush()
+
+
+def _listing_view(args: Mapping[str, str]) -> tuple[str, Callable]:
+    """Return the listing view name and the dumper that renders it."""
+
+    if args.get("fields") == "full":
+        return "full", dump_users
+    return "summary", dump_listing_users
+
+
+def _collection_tags(
+    tag: str, view: str, sort: Tuple[str, str]
+) -> tuple[str, ...]:
+    """Return the cache tags for a listing or search entry.
+
+    Full views and ``updated_at`` orderings depend on every profile write,
+    so they also carry ``DETAIL_TAG``; summary entries only go stale when a
+    listed column changes.
+    """
+
+    if view == "full" or sort[0] == "updated_at":
+        return (tag, DETAIL_TAG)
+    return (tag,)
+
+
+def _normalize_search_query(query: str) -> str:
+    """Drop characters no profile can match and collapse whitespace."""
+
+    return " ".join(SEARCH_QUERY_DISALLOWED.sub(" ", query).split())
+
+
+def _count_mode(args: Mapping[str, str]) -> str:
+    """Return the requested total mode: ``exact`` or ``none``."""
+
+    mode = args.get("count", "exact")
+    if mode not in COUNT_MODES:
+        raise ValueError("count must be 'exact' or 'none'")
+    return mode
+
+
 def _execute_user_repo(
     transaction_name: str, handler: Callable[[UserRepository], T]
 ) -> tuple[T | None, Response | tuple | None]:
     try:
-        with transactional_session(name=transaction_name) as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            encryptor = current_app.extensions.get("encryptor")
-            repository = UserRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            )
+        with _user_repo(transaction_name) as (_, repository):
             return handler(repository), None
     except RepositoryError as exc:
         return None, repository_error_response(exc)
@@ -73,46 +189,71 @@ def list_users():
 
     try:
         page, per_page, sort, filters = _parse_listing_args(request.args)
+        count = _count_mode(request.args)
     except ValueError as exc:
         return error_response(400, str(exc))
+    view, dump_items = _listing_view(request.args)
 
-    cache_service = current_app.extensions.get("cache_service")
+    cache_service = _cache_service()
     cache_key = None
+    cache_tags = _collection_tags(LISTING_TAG, view, sort)
     if cache_service and cache_service.enabled:
         cache_key = cache_service.listing_key(
-            page=page, per_page=per_page, sort=sort, filters=filters
-        )
-        cached_payload = cache_service.get_json(cache_key)
-        if cached_payload is not None:
-            return jsonify(cached_payload)
-
-    result, error = _execute_user_repo(
-        "users.list",
-        lambda repo: repo.list_users(
             page=page,
             per_page=per_page,
             sort=sort,
             filters=filters,
-        ),
-    )
-    if error:
-        return error
-    items, total = result
-    payload = {
-        "items": users_schema.dump(items),
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-    }
-    if cache_service and cache_key:
-        cache_service.set_json(cache_key, payload)
-    return jsonify(payload)
+            view=view,
+            count=count,
+        )
+        cached_payload, refresh = cache_service.get_swr(
+            cache_key, tags=cache_tags
+        )
+        if not refresh:
+            return conditional_json_response(cached_payload)
+
+    try:
+        result, error = _execute_user_repo(
+            "users.list",
+            lambda repo: repo.list_users(
+                page=page,
+                per_page=per_page,
+                sort=sort,
+                filters=filters,
+                include_relations=view == "full",
+                exact_total=count == "exact",
+            ),
+        )
+        if error:
+            return error
+        payload = {
+            "items": dump_items(result.items),
+            "page": page,
+            "per_page": per_page,
+            "has_next": result.has_next,
+        }
+        if result.total is not None:
+            payload["total"] = result.total
+        if cache_service and cache_key:
+            cache_service.set_swr(cache_key, payload, tags=cache_tags)
+    finally:
+        if cache_service and cache_key:
+            cache_service.end_refresh(cache_key, tags=cache_tags)
+    return conditional_json_response(payload)
 
 
 @users_bp.get("/<int:user_id>")
 def get_user(user_id: int):
     """Return a single user profile."""
 
+    cache_service = _cache_service()
+    cache_key = None
+    if cache_service and cache_service.enabled:
+        cache_key = cache_service.profile_key(user_id)
+        cached = cache_service.get_json(cache_key)
+        if cached is not None:
+            return conditional_json_response({"user": cached})
+
     user, error = _execute_user_repo(
         "users.get", lambda repo: repo.get(user_id)
     )
@@ -120,36 +261,30 @@ def get_user(user_id: int):
         return error
     if user is None:
         return error_response(404, "user not found")
-    return jsonify({"user": user_schema.dump(user)})
+    serialized = user_schema.dump(user)
+    if cache_service and cache_key:
+        cache_service.set_json(cache_key, serialized)
+    return conditional_json_response({"user": serialized})
 
 
 @users_bp.put("/<int:user_id>")
 def update_user(user_id: int):
     """Update a user profile."""
 
-    payload = request.get_json(silent=True)
+    payload = read_json_body()
     if payload is None:
         return error_response(400, "missing request body")
     try:
-        data = update_schema.load(payload)
+        data = load_update(payload)
     except ValidationError as exc:
         return error_response(422, "invalid payload", exc.messages)
 
     try:
-        with transactional_session(name="users.update") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            encryptor = current_app.extensions.get("encryptor")
-            repo = UserRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            )
-            user = repo.get(user_id)
-            if user is None:
+        with _user_repo("users.update") as (_, repo):
+            updated = repo.update_user_by_id(user_id, data)
+            if updated is None:
                 return error_response(404, "user not found")
-            updated = repo.update_user(user, data)
-            response = jsonify({"user": user_schema.dump(updated)})
+            response = json_response({"user": user_schema.dump(updated)})
     except RepositoryError as exc:
         return repository_error_response(exc)
 
@@ -161,15 +296,7 @@ def delete_user(user_id: int):
     """Delete a user profile."""
 
     try:
-        with transactional_session(name="users.delete") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            encryptor = current_app.extensions.get("encryptor")
-            repo = UserRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            )
+        with _user_repo("users.delete") as (_, repo):
             user = repo.get(user_id)
             if user is None:
                 return error_response(404, "user not found")
@@ -184,47 +311,43 @@ def delete_user(user_id: int):
 def upsert_preferences(user_id: int):
     """Replace preferences for a user."""
 
-    payload = request.get_json(silent=True)
+    payload = read_json_body()
     if not isinstance(payload, dict) or "preferences" not in payload:
         return error_response(400, "preferences payload required")
     preferences = payload["preferences"]
     if not isinstance(preferences, dict):
         return error_response(400, "preferences must be an object")
 
-    normalized: dict[str, str | None] = {}
-    for key, value in preferences.items():
-        if not isinstance(key, str) or not key.strip():
-            return error_response(422, "invalid preference key")
-        normalized[key.strip()] = None if value is None else str(value)
+    if not all(isinstance(key, str) and key.strip() for key in preferences):
+        return error_response(422, "invalid preference key")
+    # Keys equal after stripping collapse; the last value wins.
+    normalized: dict[str, str | None] = {
+        key.strip(): (
+            value
+            if type(value) is str
+            else None if value is None else str(value)
+        )
+        for key, value in preferences.items()
+    }
 
     try:
-        with transactional_session(name="users.preferences") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            encryptor = current_app.extensions.get("encryptor")
-            repo = UserRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            )
+        with _user_repo("users.preferences") as (_, repo):
             user = repo.get(user_id)
             if user is None:
                 return error_response(404, "user not found")
             repo.set_preferences(user, normalized)
-            serialized = user_schema.dump(user)
     except RepositoryError as exc:
         return repository_error_response(exc)
 
-    return jsonify(
-        {"preferences": serialized["preferences"], "user_id": user_id}
-    )
+    # set_preferences replaces the whole set, so it now equals ``normalized``.
+    return json_response({"preferences": normalized, "user_id": user_id})
 
 
 @users_bp.put("/<int:user_id>/privacy")
 def update_privacy(user_id: int):
     """Persist privacy settings and active tokens."""
 
-    payload = request.get_json(silent=True)
+    payload = read_json_body()
     if payload is None:
         return error_response(400, "missing request body")
     privacy_settings = payload.get("privacy_settings")
@@ -235,15 +358,7 @@ def update_privacy(user_id: int):
         return error_response(422, "active_tokens must be a list")
 
     try:
-        with transactional_session(name="users.privacy") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            encryptor = current_app.extensions.get("encryptor")
-            repo = UserRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            )
+        with _user_repo("users.privacy") as (_, repo):
             user = repo.get(user_id)
             if user is None:
                 return error_response(404, "user not found")
@@ -252,17 +367,21 @@ def update_privacy(user_id: int):
                 privacy_settings=privacy_settings,
                 active_tokens=active_tokens,
             )
-            serialized = user_schema.dump(user)
+            serialized = privacy_schema.dump(user)
     except RepositoryError as exc:
         return repository_error_response(exc)
 
-    return jsonify({"user": serialized})
+    return json_response({"user": serialized})
 
 
 @users_bp.post("/<int:user_id>/photo")
 def upload_photo(user_id: int):
     """Upload and associate a profile photo."""
 
+    # Refuse oversized bodies from their header, before the multipart
+    # parser spools them.
+    if (request.content_length or 0) > MAX_REQUEST_SIZE:
+        return error_response(422, "file too large")
     file = request.files.get("photo")
     if file is None:
         return error_response(400, "photo file required")
@@ -275,39 +394,41 @@ def upload_photo(user_id: int):
         "/uploads",
     )
 
+    # Write the file before opening the transaction so a slow disk does not
+    # hold a database connection.
     try:
-        with transactional_session(name="users.photo") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            repo = UserRepository(session, cache_hooks=cache_hooks)
-            user = repo.get(user_id)
-            if user is None:
-                return error_response(404, "user not found")
-            try:
-                photo_url = save_user_photo(
-                    file,
-                    user_id=user.id,
-                    upload_folder=upload_folder,
-                    url_prefix=url_prefix,
-                )
-            except UploadError as exc:
-                return error_response(422, str(exc))
-            repo.set_photo_url(user, photo_url)
-            response = jsonify({"photo_url": photo_url, "user_id": user.id})
-            response.status_code = 201
+        saved = save_user_photo(
+            file,
+            user_id=user_id,
+            upload_folder=upload_folder,
+            url_prefix=url_prefix,
+        )
+    except UploadError as exc:
+        return error_response(422, str(exc))
+    photo_url = saved.url
+
+    # An identical earlier upload may still be referenced; only discard a
+    # file this request wrote.
+    try:
+        with _user_repo("users.photo") as (_, repo):
+            updated = repo.set_photo_url_by_id(user_id, photo_url)
     except RepositoryError as exc:
+        if saved.created:
+            remove_user_photo(photo_url, upload_folder=upload_folder)
         return repository_error_response(exc)
+    if not updated:
+        if saved.created:
+            remove_user_photo(photo_url, upload_folder=upload_folder)
+        return error_response(404, "user not found")
 
-    return response
+    return json_response({"photo_url": photo_url, "user_id": user_id}, 201)
 
 
 @users_bp.post("/<int:user_id>/activities")
 def log_activity(user_id: int):
     """Record a user activity entry."""
 
-    payload = request.get_json(silent=True)
+    payload = read_json_body()
     if payload is None:
         return error_response(400, "missing request body")
     activity_type = payload.get("activity_type")
@@ -321,23 +442,18 @@ def log_activity(user_id: int):
         return error_response(422, "score_delta must be an integer")
 
     try:
-        with transactional_session(name="users.activity") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            repo = UserRepository(session, cache_hooks=cache_hooks)
-            user = repo.get(user_id)
-            if user is None:
-                return error_response(404, "user not found")
-            activity = repo.record_activity(
-                user,
+        with _user_repo("users.activity") as (_, repo):
+            activity = repo.record_activity_by_id(
+                user_id,
                 activity_type=activity_type.strip(),
                 description=description,
                 score_delta=score_delta_int,
             )
-            response = jsonify({"activity": activity_schema.dump(activity)})
-            response.status_code = 201
+            if activity is None:
+                return error_response(404, "user not found")
+            response = json_response(
+                {"activity": activity_schema.dump(activity)}, 201
+            )
     except RepositoryError as exc:
         return repository_error_response(exc)
 
@@ -349,27 +465,26 @@ def list_activities(user_id: int):
     """List recent activities for a user."""
 
     try:
-        limit = _parse_int(
-            request.args.get("limit"),
-            default=50,
-            min_value=1,
-            max_value=200,
-        )
+        page, limit = _parse_page_args(request.args)
     except ValueError as exc:
         return error_response(400, str(exc))
 
     try:
-        with transactional_session(name="users.activities.list") as session:
-            encryptor = current_app.extensions.get("encryptor")
-            repo = UserRepository(session, encryptor=encryptor)
-            user = repo.get(user_id)
-            if user is None:
+        with _user_repo("users.activities.list") as (_, repo):
+            if not repo.exists(user_id):
                 return error_response(404, "user not found")
-            activities = repo.list_activities(user, limit=limit)
+            activities, total = repo.list_activities(
+                user_id, limit=limit, offset=(page - 1) * limit
+            )
     except RepositoryError as exc:
         return repository_error_response(exc)
-    return jsonify(
-        {"items": activities_schema.dump(activities), "total": len(activities)}
+    return conditional_json_response(
+        {
+            "items": dump_activities(activities),
+            "page": page,
+            "limit": limit,
+            "total": total,
+        }
     )
 
 
@@ -383,11 +498,31 @@ def search_users():
 
     try:
         page, per_page, sort, filters = _parse_listing_args(request.args)
+        count = _count_mode(request.args)
     except ValueError as exc:
         return error_response(400, str(exc))
+    view, dump_items = _listing_view(request.args)
+
+    query = _normalize_search_query(query)
+    if not (
+        SEARCH_QUERY_MIN_LENGTH <= len(query) <= SEARCH_QUERY_MAX_LENGTH
+    ):
+        # Too short to be selective or too long to be a real query: answer
+        # without scanning the table.
+        payload = {
+            "items": [],
+            "page": page,
+            "per_page": per_page,
+            "has_next": False,
+            "query": query,
+        }
+        if count == "exact":
+            payload["total"] = 0
+        return json_response(payload)
 
-    cache_service = current_app.extensions.get("cache_service")
+    cache_service = _cache_service()
     cache_key = None
+    cache_tags = _collection_tags(SEARCH_TAG, view, sort)
     if cache_service and cache_service.enabled:
         cache_key = cache_service.search_key(
             query=query,
@@ -395,41 +530,52 @@ def search_users():
             per_page=per_page,
             sort=sort,
             filters=filters,
+            view=view,
+            count=count,
         )
-        cached_payload = cache_service.get_json(cache_key)
-        if cached_payload is not None:
-            return jsonify(cached_payload)
+        cached_payload, refresh = cache_service.get_swr(
+            cache_key, tags=cache_tags
+        )
+        if not refresh:
+            return json_response(cached_payload)
 
-    result, error = _execute_user_repo(
-        "users.search",
-        lambda repo: repo.search_users(
-            query=query,
-            page=page,
-            per_page=per_page,
-            sort=sort,
-            filters=filters,
-        ),
-    )
-    if error:
-        return error
-    items, total = result
-    payload = {
-        "items": users_schema.dump(items),
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "query": query,
-    }
-    if cache_service and cache_key:
-        cache_service.set_json(cache_key, payload)
-    return jsonify(payload)
+    try:
+        result, error = _execute_user_repo(
+            "users.search",
+            lambda repo: repo.search_users(
+                query=query,
+                page=page,
+                per_page=per_page,
+                sort=sort,
+                filters=filters,
+                include_relations=view == "full",
+                exact_total=count == "exact",
+            ),
+        )
+        if error:
+            return error
+        payload = {
+            "items": dump_items(result.items),
+            "page": page,
+            "per_page": per_page,
+            "has_next": result.has_next,
+            "query": query,
+        }
+        if result.total is not None:
+            payload["total"] = result.total
+        if cache_service and cache_key:
+            cache_service.set_swr(cache_key, payload, tags=cache_tags)
+    finally:
+        if cache_service and cache_key:
+            cache_service.end_refresh(cache_key, tags=cache_tags)
+    return json_response(payload)
 
 
 @users_bp.post("/<int:user_id>/sessions")
 def create_session(user_id: int):
     """Create an encrypted session for a user."""
 
-    payload = request.get_json(silent=True)
+    payload = read_json_body()
     if payload is None:
         return error_response(400, "missing request body")
     session_token = payload.get("session_token")
@@ -438,18 +584,15 @@ def create_session(user_id: int):
     expires_at_raw = payload.get("expires_at")
     expires_at = None
     if expires_at_raw is not None:
+        if not isinstance(expires_at_raw, str):
+            return error_response(422, "invalid datetime format")
         try:
-            expires_at = _parse_iso_datetime(str(expires_at_raw))
+            expires_at = parse_iso_datetime(expires_at_raw)
         except ValueError as exc:
             return error_response(422, str(exc))
 
     try:
-        with transactional_session(name="users.sessions.create") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            repo = UserRepository(session, cache_hooks=cache_hooks)
+        with _user_repo("users.sessions.create") as (_, repo):
             user = repo.get(user_id)
             if user is None:
                 return error_response(404, "user not found")
@@ -461,8 +604,9 @@ def create_session(user_id: int):
                 user_agent=payload.get("user_agent"),
                 expires_at=expires_at,
             )
-            response = jsonify({"session": session_schema.dump(record)})
-            response.status_code = 201
+            response = json_response(
+                {"session": session_schema.dump(record)}, 201
+            )
     except RepositoryError as exc:
         return repository_error_response(exc)
 
@@ -474,16 +618,27 @@ def list_sessions(user_id: int):
     """List encrypted sessions for a user."""
 
     try:
-        with transactional_session(name="users.sessions.list") as session:
-            repo = UserRepository(session)
-            user = repo.get(user_id)
-            if user is None:
+        page, limit = _parse_page_args(request.args)
+    except ValueError as exc:
+        return error_response(400, str(exc))
+
+    try:
+        with _user_repo("users.sessions.list") as (_, repo):
+            # Loading the user would also load every session it owns.
+            if not repo.exists(user_id):
                 return error_response(404, "user not found")
-            records = repo.list_sessions(user)
+            records, total = repo.list_sessions(
+                user_id, limit=limit, offset=(page - 1) * limit
+            )
     except RepositoryError as exc:
         return repository_error_response(exc)
-    return jsonify(
-        {"items": sessions_schema.dump(records), "total": len(records)}
+    return conditional_json_response(
+        {
+            "items": dump_sessions(records),
+            "page": page,
+            "limit": limit,
+            "total": total,
+        }
     )
 
 
@@ -492,12 +647,7 @@ def revoke_session(user_id: int, session_id: int):
     """Revoke a session token."""
 
     try:
-        with transactional_session(name="users.sessions.revoke") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            repo = UserRepository(session, cache_hooks=cache_hooks)
+        with _user_repo("users.sessions.revoke") as (_, repo):
             record = repo.get_session_by_id(session_id)
             if record is None or record.user_id != user_id:
                 return error_response(404, "session not found")
@@ -513,15 +663,7 @@ def export_user(user_id: int):
     """Provide a full export of the user profile and related records."""
 
     try:
-        with transactional_session(name="users.export") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            encryptor = current_app.extensions.get("encryptor")
-            repo = UserRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            )
+        with _user_repo("users.export") as (session, repo):
             user = repo.get(user_id)
             if user is None:
                 return error_response(404, "user not found")
@@ -549,7 +691,7 @@ def export_user(user_id: int):
         return repository_error_response(exc)
 
     payload["exported_at"] = datetime.now(timezone.utc).isoformat()
-    return jsonify(payload)
+    return json_response(payload)
 
 
 @users_bp.post("/<int:user_id>/erase")
@@ -561,15 +703,7 @@ def erase_user(user_id: int):
     purge_after = datetime.now(timezone.utc) + timedelta(days=retention_days)
 
     try:
-        with transactional_session(name="users.erase") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            encryptor = current_app.extensions.get("encryptor")
-            repo = UserRepository(
-                session, cache_hooks=cache_hooks, encryptor=encryptor
-            )
+        with _user_repo("users.erase") as (session, repo):
             user = repo.get(user_id)
             if user is None:
                 return error_response(404, "user not found")
@@ -592,14 +726,14 @@ def erase_user(user_id: int):
         return repository_error_response(exc)
 
     result["retention_days"] = retention_days
-    return jsonify({"user": result}), 202
+    return json_response({"user": result}, 202)
 
 
 @users_bp.post("/<int:user_id>/connections")
 def create_connection(user_id: int):
     """Create an extended social connection."""
 
-    payload = request.get_json(silent=True)
+    payload = read_json_body()
     if payload is None:
         return error_response(400, "missing request body")
     connection_type = payload.get("connection_type")
@@ -610,12 +744,7 @@ def create_connection(user_id: int):
         return error_response(422, "attributes must be an object")
 
     try:
-        with transactional_session(name="users.connections.create") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            repo = UserRepository(session, cache_hooks=cache_hooks)
+        with _user_repo("users.connections.create") as (_, repo):
             user = repo.get(user_id)
             if user is None:
                 return error_response(404, "user not found")
@@ -627,10 +756,9 @@ def create_connection(user_id: int):
                 external_reference=payload.get("external_reference"),
                 attributes=attributes,
             )
-            response = jsonify(
-                {"connection": connection_schema.dump(connection)}
+            response = json_response(
+                {"connection": connection_schema.dump(connection)}, 201
             )
-            response.status_code = 201
     except RepositoryError as exc:
         return repository_error_response(exc)
     return response
@@ -642,18 +770,28 @@ def list_connections(user_id: int):
 
     status = request.args.get("status")
     try:
-        with transactional_session(name="users.connections.list") as session:
-            repo = UserRepository(session)
-            user = repo.get(user_id)
-            if user is None:
+        page, limit = _parse_page_args(request.args)
+    except ValueError as exc:
+        return error_response(400, str(exc))
+
+    try:
+        with _user_repo("users.connections.list") as (_, repo):
+            if not repo.exists(user_id):
                 return error_response(404, "user not found")
-            connections = repo.list_connections(user, status=status or None)
+            connections, total = repo.list_connections(
+                user_id,
+                status=status or None,
+                limit=limit,
+                offset=(page - 1) * limit,
+            )
     except RepositoryError as exc:
         return repository_error_response(exc)
-    return jsonify(
+    return conditional_json_response(
         {
-            "items": connections_schema.dump(connections),
-            "total": len(connections),
+            "items": dump_connections(connections),
+            "page": page,
+            "limit": limit,
+            "total": total,
         }
     )
 
@@ -662,7 +800,7 @@ def list_connections(user_id: int):
 def update_connection(user_id: int, connection_id: int):
     """Update connection status or metadata."""
 
-    payload = request.get_json(silent=True)
+    payload = read_json_body()
     if payload is None:
         return error_response(400, "missing request body")
     status = payload.get("status")
@@ -675,12 +813,7 @@ def update_connection(user_id: int, connection_id: int):
         return error_response(422, "attributes must be an object")
 
     try:
-        with transactional_session(name="users.connections.update") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            repo = UserRepository(session, cache_hooks=cache_hooks)
+        with _user_repo("users.connections.update") as (_, repo):
             connection = repo.get_connection_by_id(connection_id)
             if connection is None or connection.user_id != user_id:
                 return error_response(404, "connection not found")
@@ -693,7 +826,7 @@ def update_connection(user_id: int, connection_id: int):
     except RepositoryError as exc:
         return repository_error_response(exc)
 
-    return jsonify({"connection": result})
+    return json_response({"connection": result})
 
 
 @users_bp.delete("/<int:user_id>/connections/<int:connection_id>")
@@ -701,12 +834,7 @@ def delete_connection(user_id: int, connection_id: int):
     """Remove a connection."""
 
     try:
-        with transactional_session(name="users.connections.delete") as session:
-            cache_service = current_app.extensions.get("cache_service")
-            cache_hooks = (
-                cache_service.build_hooks() if cache_service else None
-            )
-            repo = UserRepository(session, cache_hooks=cache_hooks)
+        with _user_repo("users.connections.delete") as (_, repo):
             connection = repo.get_connection_by_id(connection_id)
             if connection is None or connection.user_id != user_id:
                 return error_response(404, "connection not found")
@@ -730,11 +858,11 @@ def _parse_listing_args(
     )
     sort = _parse_sort(args.get("sort"))
 
-    filters: dict[str, object] = {}
-    for key in ("industry", "location"):
-        value = (args.get(key) or "").strip()
-        if value:
-            filters[key] = value
+    filters: dict[str, object] = {
+        key: value
+        for key in STRING_FILTER_KEYS
+        if (value := (args.get(key) or "").strip())
+    }
 
     min_exp = _parse_int(args.get("min_experience"), default=None, min_value=0)
     max_exp = _parse_int(args.get("max_experience"), default=None, min_value=0)
@@ -753,13 +881,26 @@ def _parse_listing_args(
 
     skills_raw = args.get("skills")
     if skills_raw:
-        skills = normalize_string_list(skills_raw.split(","))
+        skills = split_string_list(skills_raw)
         if skills:
             filters["skills"] = skills
 
     return page, per_page, sort, filters
 
 
+def _parse_page_args(args: Mapping[str, str]) -> Tuple[int, int]:
+    """Parse ``page``/``limit`` arguments for per-user collections."""
+
+    page = _parse_int(args.get("page"), default=1, min_value=1)
+    limit = _parse_int(
+        args.get("limit"),
+        default=50,
+        min_value=1,
+        max_value=200,
+    )
+    return page, limit
+
+
 def _parse_int(
     value: str | None,
     *,
@@ -769,10 +910,12 @@ def _parse_int(
 ) -> int | None:
     if value in (None, ""):
         return default
-    try:
-        parsed = int(value)
-    except (TypeError, ValueError) as exc:
-        raise ValueError(f"invalid integer: {value}") from exc
+    parsed = _SMALL_INTS.get(value)
+    if parsed is None:
+        try:
+            parsed = int(value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"invalid integer: {value}") from exc
     if min_value is not None and parsed < min_value:
         raise ValueError(f"value must be >= {min_value}")
     if max_value is not None and parsed > max_value:
@@ -780,7 +923,10 @@ def _parse_int(
     return parsed
 
 
+@lru_cache(maxsize=128)
 def _parse_sort(sort_value: str | None) -> Tuple[str, str]:
+    # Valid spellings are few, so each is normalized once per process;
+    # invalid ones raise and are never cached.
     raw = (sort_value or "").strip() or "created_at:desc"
     field, _, direction = raw.partition(":")
     field = field or DEFAULT_SORT[0]
@@ -791,10 +937,3 @@ def _parse_sort(sort_value: str | None) -> Tuple[str, str]:
     if direction not in {"asc", "desc"}:
         raise ValueError("invalid sort direction")
     return field, direction
-
-
-def _parse_iso_datetime(value: str) -> datetime:
-    try:
-        return datetime.fromisoformat(value)
-    except ValueError as exc:  # pragma: no cover - python <3.11 compatibility
-        raise ValueError("invalid datetime format") from exc
@@ -0,0 +1,207 @@
+"""Precompiled dump and load functions for hot-path Marshmallow schemas.
+
+These reuse private Marshmallow helpers (processor lookup, ``ErrorStore``)
+and are only known to match the pinned release; ``tests/test_schemas.py``
+checks every route dumper and the update loader against the public API.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Mapping
+
+from marshmallow import EXCLUDE, RAISE, Schema, ValidationError, missing
+from marshmallow.decorators import (
+    POST_DUMP,
+    POST_LOAD,
+    PRE_DUMP,
+    PRE_LOAD,
+    VALIDATES,
+    VALIDATES_SCHEMA,
+)
+from marshmallow.error_store import ErrorStore
+from marshmallow.fields import Field
+
+Dumper = Callable[[Any], Any]
+Loader = Callable[[Any], Any]
+
+
+def compile_dumper(schema: Schema) -> Dumper:
+    """Return a dump function equivalent to ``schema.dump``.
+
+    Field names, data keys and bound serializers are resolved once into an
+    accessor table. Fields that read a same-named attribute without a dump
+    default skip ``Field.serialize`` and are fetched with ``getattr``.
+    Pre/post dump hooks declared on the schema still run. When the schema
+    was built with ``many=True`` the returned function expects an iterable.
+    """
+
+    direct_access = type(schema).get_attribute is Schema.get_attribute
+    fields = tuple(
+        (
+            field.data_key if field.data_key is not None else name,
+            name,
+            field._serialize
+            if direct_access and _reads_plain_attribute(field)
+            else None,
+            field.serialize,
+        )
+        for name, field in schema.dump_fields.items()
+    )
+    accessor = schema.get_attribute
+    many = schema.many
+    has_pre_dump = schema._has_processors(PRE_DUMP)
+    has_post_dump = schema._has_processors(POST_DUMP)
+
+    def serialize(obj: Any) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        # Mappings go through marshmallow's accessor, which prefers items.
+        plain = not hasattr(obj, "__getitem__")
+        for key, name, serialize_value, serialize_field in fields:
+            if plain and serialize_value is not None:
+                value = getattr(obj, name, missing)
+                if value is not missing:
+                    data[key] = serialize_value(value, name, obj)
+                continue
+            value = serialize_field(name, obj, accessor=accessor)
+            if value is not missing:
+                data[key] = value
+        return data
+
+    def dump(obj: Any) -> Any:
+        source = obj
+        if has_pre_dump:
+            source = schema._invoke_dump_processors(
+                PRE_DUMP, obj, many=many, original_data=obj
+            )
+        if many:
+            result: Any = [serialize(item) for item in source]
+        else:
+            result = serialize(source)
+        if has_post_dump:
+            result = schema._invoke_dump_processors(
+                POST_DUMP, result, many=many, original_data=obj
+            )
+        return result
+
+    return dump
+
+
+def compile_loader(schema: Schema) -> Loader:
+    """Return a load function equivalent to ``schema.load``.
+
+    Data keys, attribute names and bound deserializers are resolved once.
+    Pre/post load hooks and schema validators still run and errors are
+    reported exactly as ``schema.load`` would. Only single-object schemas
+    without ``partial``, field-level validators or ``unknown=INCLUDE`` are
+    compiled; anything else gets ``schema.load`` back.
+    """
+
+    if (
+        schema.many
+        or schema.partial
+        or schema.unknown not in (RAISE, EXCLUDE)
+        or schema._hooks[VALIDATES]
+    ):
+        return schema.load
+
+    fields = tuple(
+        (
+            field.data_key if field.data_key is not None else name,
+            field.attribute or name,
+            field.deserialize,
+        )
+        for name, field in schema.load_fields.items()
+    )
+    known_keys = frozenset(key for key, _, _ in fields)
+    raise_unknown = schema.unknown == RAISE
+    unknown_message = schema.error_messages["unknown"]
+    type_message = schema.error_messages["type"]
+    has_pre_load = schema._has_processors(PRE_LOAD)
+    has_validators = schema._has_processors(VALIDATES_SCHEMA)
+    has_post_load = schema._has_processors(POST_LOAD)
+
+    def fail(errors: Any, data: Any, result: Any) -> None:
+        exc = ValidationError(errors, data=data, valid_data=result)
+        schema.handle_error(exc, data, many=False, partial=None)
+        raise exc
+
+    def load(data: Any) -> Any:
+        processed = data
+        if has_pre_load:
+            try:
+                processed = schema._invoke_load_processors(
+                    PRE_LOAD,
+                    data,
+                    many=False,
+                    original_data=data,
+                    partial=None,
+                )
+            except ValidationError as err:
+                fail(err.normalized_messages(), data, None)
+
+        error_store = ErrorStore()
+        result: dict[str, Any] = {}
+        if not isinstance(processed, Mapping):
+            error_store.store_error([type_message])
+        else:
+            for key, attr, deserialize in fields:
+                try:
+                    value = deserialize(
+                        processed.get(key, missing), key, processed
+                    )
+                except ValidationError as err:
+                    error_store.store_error(err.messages, key)
+                    value = err.valid_data or missing
+                if value is not missing:
+                    result[attr] = value
+            if raise_unknown:
+                for key in processed.keys() - known_keys:
+                    error_store.store_error([unknown_message], key)
+
+        if has_validators:
+            field_errors = bool(error_store.errors)
+            for pass_many in (True, False):
+                schema._invoke_schema_validators(
+                    error_store=error_store,
+                    pass_many=pass_many,
+                    data=result,
+                    original_data=data,
+                    many=False,
+                    partial=None,
+                    field_errors=field_errors,
+                )
+        errors = error_store.errors
+        if not errors and has_post_load:
+            try:
+                return schema._invoke_load_processors(
+                    POST_LOAD,
+                    result,
+                    many=False,
+                    original_data=data,
+                    partial=None,
+                )
+            except ValidationError as err:  # pragma: no cover - no such hook
+                errors = err.normalized_messages()
+        if errors:
+            fail(errors, data, result)
+        return result
+
+    return load
+
+
+def _reads_plain_attribute(field: Field) -> bool:
+    """Return whether ``field`` can bypass ``Field.serialize``.
+
+    Such fields read the attribute of the same name and have no dump
+    default, so ``Field.serialize`` reduces to ``getattr`` followed by
+    ``Field._serialize``.
+    """
+
+    return (
+        field._CHECK_ATTRIBUTE
+        and field.attribute is None
+        and field.dump_default is missing
+    )
+
+
+__all__ = ["compile_dumper", "compile_loader"]
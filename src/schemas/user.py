@@ -3,20 +3,45 @@ from __future__ import annotations
 
 from typing import Any, Iterable
 
-from marshmallow import (
-    Schema,
-    ValidationError,
-    fields,
-    post_dump,
-    post_load,
-    pre_load,
-    validates_schema,
-)
+from marshmallow import Schema, ValidationError, fields, validates_schema
 from marshmallow.validate import Length, Range, URL
 
 from src.utils.lists import decode_string_list, normalize_string_list
 
 
+# The load-side transforms live on fields rather than in pre/post-load hooks
+# so that loading a payload dispatches no schema-level processors.
+class _NormalizedList(fields.List):
+    """String list loaded through :func:`normalize_string_list`."""
+
+    def _deserialize(self, value, attr, data, **kwargs) -> list[str]:
+        return normalize_string_list(
+            super()._deserialize(value, attr, data, **kwargs)
+        )
+
+
+class _TokenList(fields.List):
+    """Token list loaded stripped, without blanks or duplicates."""
+
+    def _deserialize(self, value, attr, data, **kwargs) -> list[str]:
+        tokens = super()._deserialize(value, attr, data, **kwargs)
+        stripped = (str(token).strip() for token in tokens)
+        return list(dict.fromkeys(token for token in stripped if token))
+
+
+class _OptionalURL(fields.String):
+    """URL string where an empty value clears the field."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(validate=URL(), allow_none=True, **kwargs)
+
+    def deserialize(self, value, attr=None, data=None, **kwargs):
+        # Clear blanks before validation, which would reject "" as a URL.
+        if value == "":
+            value = None
+        return super().deserialize(value, attr, data, **kwargs)
+
+
 class UserSocialAccountSchema(Schema):
     """Schema for serializing linked social accounts."""
 
@@ -110,7 +135,9 @@ class UserSchema(Schema):
     is_active = fields.Boolean()
     engagement_score = fields.Integer(required=True)
     reputation_score = fields.Integer(required=True)
-    privacy_settings = fields.Dict(keys=fields.String(), values=fields.Raw())
+    privacy_settings = fields.Dict(
+        keys=fields.String(), values=fields.Raw(), dump_default=dict
+    )
     active_tokens = fields.List(fields.String(), dump_default=list)
     deactivated_at = fields.DateTime(allow_none=True)
     pseudonymized_at = fields.DateTime(allow_none=True)
@@ -147,31 +174,14 @@ class UserSchema(Schema):
             for pref in preferences
         }
 
-    @post_dump
-    def ensure_defaults(
-        self,
-        data: dict[str, Any],
-        **_: Any,
-    ) -> dict[str, Any]:
-        data.setdefault("preferences", {})
-        data.setdefault("social_accounts", [])
-        data.setdefault("skills", [])
-        data.setdefault("interests", [])
-        data.setdefault("active_tokens", [])
-        data.setdefault("activities", [])
-        data.setdefault("verifications", [])
-        data.setdefault("connections", [])
-        data.setdefault("sessions", [])
-        data.setdefault("privacy_settings", {})
-        return data
-
+    # Only ``User`` rows are dumped, and the model always maps both columns.
     @staticmethod
     def _dump_skills(obj: Any) -> list[str]:
-        return decode_string_list(getattr(obj, "skills", None))
+        return decode_string_list(obj.skills)
 
     @staticmethod
     def _dump_interests(obj: Any) -> list[str]:
-        return decode_string_list(getattr(obj, "interests", None))
+        return decode_string_list(obj.interests)
 
 
 class UserUpdateSchema(Schema):
@@ -182,7 +192,7 @@ class UserUpdateSchema(Schema):
     company = fields.String(validate=Length(max=120))
     location = fields.String(validate=Length(max=120))
     industry = fields.String(validate=Length(max=120))
-    linkedin_url = fields.String(validate=URL(), allow_none=True)
+    linkedin_url = _OptionalURL()
     experience_years = fields.Integer(validate=Range(min=0, max=100))
     bio = fields.String(validate=Length(max=2000))
     timezone = fields.String(validate=Length(max=64))
@@ -193,52 +203,19 @@ class UserUpdateSchema(Schema):
         keys=fields.String(validate=Length(min=1, max=60)),
         values=fields.Raw(),
     )
-    active_tokens = fields.List(
+    active_tokens = _TokenList(
         fields.String(validate=Length(min=1, max=255)),
         load_default=None,
     )
-    skills = fields.List(
+    skills = _NormalizedList(
         fields.String(validate=Length(min=1, max=60)),
         load_default=None,
     )
-    interests = fields.List(
+    interests = _NormalizedList(
         fields.String(validate=Length(min=1, max=60)),
         load_default=None,
     )
 
-    @post_load
-    def _normalize_lists(
-        self,
-        data: dict[str, Any],
-        **_: Any,
-    ) -> dict[str, Any]:
-        for key in ("skills", "interests"):
-            if key in data and data[key] is not None:
-                data[key] = normalize_string_list(data[key])
-        if "linkedin_url" in data and not data["linkedin_url"]:
-            data["linkedin_url"] = None
-        if "active_tokens" in data and data["active_tokens"] is not None:
-            seen: set[str] = set()
-            normalized_tokens: list[str] = []
-            for token in data["active_tokens"]:
-                token_str = str(token).strip()
-                if not token_str or token_str in seen:
-                    continue
-                seen.add(token_str)
-                normalized_tokens.append(token_str)
-            data["active_tokens"] = normalized_tokens
-        return data
-
-    @pre_load
-    def _coerce_blank(
-        self,
-        data: dict[str, Any],
-        **_: Any,
-    ) -> dict[str, Any]:
-        if isinstance(data, dict) and data.get("linkedin_url", None) == "":
-            data["linkedin_url"] = None
-        return data
-
     @validates_schema
     def _ensure_payload(self, data: dict[str, Any], **_: Any) -> None:
         if not data:
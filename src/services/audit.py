@@ -2,12 +2,110 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import atexit
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional, Sequence
 
-from flask import has_request_context, request
+from flask import current_app, has_app_context, has_request_context, request
 
 from src.models.repositories.audit import AuditLogRepository
-from src.services.transactions import transactional_session
+from src.services.transactions import active_session, transactional_session
+
+logger = logging.getLogger(__name__)
+
+AuditPayload = dict[str, Any]
+
+
+def _write_batch(payloads: Sequence[AuditPayload]) -> None:
+    with transactional_session(name="audit.batch") as session:
+        AuditLogRepository(session).record_events(payloads)
+
+
+class AuditEventQueue:
+    """Write audit events from a background thread in batches.
+
+    Events are inserted ``batch_size`` at a time, or after
+    ``flush_interval`` seconds when fewer are pending, each batch in a
+    single transaction. :meth:`close` drains what is left and runs at
+    interpreter exit.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = 100,
+        flush_interval: float = 0.25,
+        writer: Callable[[Sequence[AuditPayload]], None] = _write_batch,
+    ) -> None:
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = max(flush_interval, 0.001)
+        self._writer = writer
+        self._queue: queue.Queue[AuditPayload | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def put(self, payload: AuditPayload) -> None:
+        """Queue ``payload`` and return without touching the database."""
+
+        self._ensure_started()
+        self._queue.put(payload)
+
+    def flush(self) -> None:
+        """Block until every queued event has been written."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write pending events and stop the worker thread."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            batch: list[AuditPayload] = []
+            if first is None:
+                stopping = True
+            else:
+                batch.append(first)
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+            if batch:
+                try:
+                    self._writer(batch)
+                except Exception:  # pragma: no cover - log only
+                    logger.exception(
+                        "audit.batch failed events=%s", len(batch)
+                    )
+            for _ in range(len(batch) + stopping):
+                self._queue.task_done()
 
 
 def log_audit_event(
@@ -18,7 +116,14 @@ def log_audit_event(
     actor: Optional[str] = None,
     details: Optional[dict[str, object]] = None,
 ) -> None:
-    """Persist a security-relevant event for traceability."""
+    """Persist a security-relevant event for traceability.
+
+    The entry joins the caller-provided ``session``, or else the
+    enclosing :func:`transactional_session`, so it commits or rolls back
+    with the change it describes. Outside any transaction it goes to the
+    application's :class:`AuditEventQueue` when one is configured, or is
+    committed in its own transaction.
+    """
 
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
@@ -37,12 +142,23 @@ def log_audit_event(
         "details": details or {},
     }
 
+    if session is None:
+        session = active_session()
     if session is not None:
         AuditLogRepository(session).record_event(**payload)
         return
 
+    audit_queue = None
+    if has_app_context():
+        audit_queue = current_app.extensions.get("audit_queue")
+    if audit_queue is not None:
+        # Stamp the event now; the batch may be written a little later.
+        payload["created_at"] = datetime.now(timezone.utc)
+        audit_queue.put(payload)
+        return
+
     with transactional_session(name=f"audit.{event}") as audit_session:
         AuditLogRepository(audit_session).record_event(**payload)
 
 
-__all__ = ["log_audit_event"]
+__all__ = ["AuditEventQueue", "log_audit_event"]
@@ -3,19 +3,46 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import logging
+import secrets
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Callable, Iterable, Mapping, MutableMapping, Sequence
+from typing import Any, Callable, Iterable, Mapping, Sequence
 
+from orjson import OPT_SORT_KEYS, dumps as _dumps, loads as _loads
 from prometheus_client import Counter, Histogram
 from redis import Redis
 
+try:  # pragma: no cover - optional C accelerator
+    from xxhash import xxh3_64_hexdigest as _digest
+except ImportError:  # pragma: no cover - stdlib fallback
+
+    def _digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _canonical(payload: Mapping[str, object]) -> bytes:
+    return _dumps(payload, option=OPT_SORT_KEYS)
+
 
 logger = logging.getLogger(__name__)
 
 CACHE_NAMESPACE = "user-service"
+REFRESH_LOCK_SECONDS = 10
+# Readers that lose a fill race block their worker while they wait, so
+# they only wait about as long as a typical rebuild takes.
+FILL_WAIT_SECONDS = 0.1
+FILL_POLL_SECONDS = 0.01
+WRITE_BLACKOUT_SECONDS = 2
+INVALIDATION_BATCH_SIZE = 500
+LISTING_TAG = "users:list"
+SEARCH_TAG = "users:search"
+# Collection entries that change with any write to a profile, not only
+# with the listed columns: full views and ``updated_at`` orderings.
+DETAIL_TAG = "users:detail"
+COLLECTION_TAGS = (LISTING_TAG, SEARCH_TAG, DETAIL_TAG)
+CACHE_OPERATIONS = ("get", "set", "tag", "delete", "lock")
 
 _CACHE_HITS = Counter(
     "user_service_cache_hits_total",
@@ -47,6 +74,40 @@ class CacheHooks:
     invalidate_collections: Callable[[], None]
 
 
+class PendingInvalidations:
+    """Buffer repository invalidations until the transaction commits.
+
+    Invalidating before the commit lets a concurrent reader cache rows the
+    transaction is about to replace; :meth:`flush` is meant to run once the
+    commit succeeded.
+    """
+
+    def __init__(self, cache_service: "CacheService") -> None:
+        self._cache_service = cache_service
+        self._profiles: set[int] = set()
+        self._collections = False
+        self.hooks = CacheHooks(
+            invalidate_profile=self._profiles.add,
+            invalidate_collections=self._mark_collections,
+        )
+
+    def _mark_collections(self) -> None:
+        self._collections = True
+
+    def flush(self) -> None:
+        # Repositories flag collections only when a listed, filtered or
+        # searched column changed; other profile writes stale just the
+        # profile and the entries tagged ``DETAIL_TAG``.
+        if self._collections:
+            self._cache_service.invalidate_user_collections(
+                profiles=self._profiles
+            )
+        elif self._profiles:
+            self._cache_service.invalidate_profile_views(self._profiles)
+        self._profiles.clear()
+        self._collections = False
+
+
 class CacheService:
     """High level API for interacting with the shared Redis cache."""
 
@@ -56,11 +117,31 @@ class CacheService:
         default_ttl: int,
         *,
         namespace: str = CACHE_NAMESPACE,
+        stale_ttl: int = 60,
     ) -> None:
         self.client = client
         self.default_ttl = max(default_ttl, 0)
+        self.stale_ttl = max(stale_ttl, 0)
         self.namespace = namespace
         self._hooks: CacheHooks | None = None
+        # Refresh locks this thread holds, by cache key, with their tokens.
+        self._held_locks = threading.local()
+        # Hot key builders append to fixed prefixes instead of going
+        # through :meth:`key`.
+        self._profile_prefix = self.key("users", "profile") + ":"
+        self._listing_prefix = self.key("users", "list") + ":"
+        self._search_prefix = self.key("users", "search") + ":"
+        # Resolve the labelled metric children once instead of per call.
+        self._hits = _CACHE_HITS.labels(namespace)
+        self._misses = _CACHE_MISSES.labels(namespace)
+        self._op_counters = {
+            operation: _CACHE_OPERATIONS.labels(namespace, operation)
+            for operation in CACHE_OPERATIONS
+        }
+        self._op_latency = {
+            operation: _CACHE_LATENCY.labels(namespace, operation)
+            for operation in CACHE_OPERATIONS
+        }
 
     # ------------------------------------------------------------------
     # Derived keys
@@ -72,7 +153,7 @@ class CacheService:
         return ":".join([self.namespace, *stringified])
 
     def profile_key(self, user_id: int) -> str:
-        return self.key("users", "profile", user_id)
+        return f"{self._profile_prefix}{user_id}"
 
     def listing_key(
         self,
@@ -81,6 +162,8 @@ class CacheService:
         per_page: int,
         sort: Sequence[str],
         filters: Mapping[str, object],
+        view: str | None = None,
+        count: str | None = None,
     ) -> str:
         payload = {
             "filters": filters,
@@ -88,8 +171,12 @@ class CacheService:
             "per_page": int(per_page),
             "sort": list(sort),
         }
+        if view is not None:
+            payload["view"] = view
+        if count is not None:
+            payload["count"] = count
         digest = self._hash_payload(payload)
-        return self.key("users", "list", digest)
+        return f"{self._listing_prefix}{digest}"
 
     def search_key(
         self,
@@ -99,6 +186,8 @@ class CacheService:
         per_page: int,
         sort: Sequence[str],
         filters: Mapping[str, object],
+        view: str | None = None,
+        count: str | None = None,
     ) -> str:
         payload = {
             "query": query,
@@ -107,8 +196,12 @@ class CacheService:
             "per_page": int(per_page),
             "sort": list(sort),
         }
+        if view is not None:
+            payload["view"] = view
+        if count is not None:
+            payload["count"] = count
         digest = self._hash_payload(payload)
-        return self.key("users", "search", digest)
+        return f"{self._search_prefix}{digest}"
 
     # ------------------------------------------------------------------
     # Basic operations
@@ -131,14 +224,12 @@ class CacheService:
         finally:
             self._record_metrics("get", start)
         if value is None:
-            _CACHE_MISSES.labels(self.namespace).inc()
+            self._misses.inc()
             return None
-        _CACHE_HITS.labels(self.namespace).inc()
-        if isinstance(value, bytes):
-            value = value.decode("utf-8")
+        self._hits.inc()
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:  # pragma: no cover - unexpected payloads
+            return _loads(value)
+        except ValueError:  # pragma: no cover - unexpected payloads
             logger.warning("cache.get invalid json key=%s", key)
             return None
 
@@ -153,7 +244,7 @@ class CacheService:
 
         if not self.enabled:
             return
-        payload = json.dumps(value, sort_keys=True)
+        payload = _dumps(value)
         ttl = self.default_ttl if ttl is None else max(int(ttl), 0)
         start = time.perf_counter()
         try:
@@ -166,6 +257,149 @@ class CacheService:
         finally:
             self._record_metrics("set", start)
 
+    def get_swr(
+        self, key: str, *, tags: Sequence[str] = ()
+    ) -> tuple[Any | None, bool]:
+        """Fetch an entry written by :meth:`set_swr`.
+
+        Returns the cached payload and whether the caller should rebuild
+        it. Once an entry leaves its fresh window only the caller that wins
+        the refresh lock is asked to rebuild; concurrent callers keep
+        serving the stale payload until it is replaced. A missing entry is
+        filled the same way: callers that lose the lock wait up to
+        ``FILL_WAIT_SECONDS`` for the winner's payload before building it
+        themselves. This holds during a write blackout too: refresh locks
+        are registered under ``tags``, so invalidating a tag drops every lock
+        taken before it, and :meth:`set_swr` only lets a winner that started
+        reading after the invalidation fill the entry.
+        """
+
+        envelope = self.get_json(key)
+        if not isinstance(envelope, dict) or "payload" not in envelope:
+            if not self.enabled:
+                return None, True
+            if self._acquire_refresh_lock(key, tags):
+                return None, True
+            payload = self._wait_for_fill(key)
+            return payload, payload is None
+        fresh_until = envelope.get("fresh_until")
+        if fresh_until is None or fresh_until > time.time():
+            return envelope["payload"], False
+        return envelope["payload"], self._acquire_refresh_lock(key, tags)
+
+    def set_swr(
+        self,
+        key: str,
+        value: Any,
+        *,
+        ttl: int | None = None,
+        tags: Sequence[str] = (),
+    ) -> None:
+        """Store ``value`` so it stays servable ``stale_ttl`` past ``ttl``.
+
+        The entry is registered under ``tags`` for :meth:`invalidate_tags`.
+        While any of the tags is in its post-invalidation blackout, only a
+        caller still holding the refresh lock it won in :meth:`get_swr` with
+        the same tags may write; anyone else may have read rows from before
+        the invalidation.
+        """
+
+        if (
+            tags
+            and self._in_blackout(tags)
+            and not self._holds_refresh_lock(key)
+        ):
+            return
+        self._thread_locks().pop(key, None)
+        ttl = self.default_ttl if ttl is None else max(int(ttl), 0)
+        envelope = {
+            "payload": value,
+            "fresh_until": time.time() + ttl if ttl else None,
+        }
+        expires = ttl + self.stale_ttl if ttl else 0
+        self.set_json(key, envelope, ttl=expires)
+        if tags:
+            self.tag(key, tags, ttl=expires)
+        self._release_refresh_lock(key, tags)
+
+    def end_refresh(self, key: str, *, tags: Sequence[str] = ()) -> None:
+        """Release the refresh lock on ``key`` if this thread still holds it.
+
+        Call it once a rebuild asked for by :meth:`get_swr` is over, even
+        when it failed; after :meth:`set_swr` stored the entry it does
+        nothing.
+        """
+
+        if self._thread_locks().pop(key, None) is not None:
+            self._release_refresh_lock(key, tags)
+
+    def tag_key(self, tag: str) -> str:
+        return self.key("tags", tag)
+
+    def tag(
+        self,
+        key: str,
+        tags: Sequence[str],
+        *,
+        ttl: int | None = None,
+    ) -> None:
+        """Register ``key`` under each of ``tags``."""
+
+        if not self.enabled or not tags:
+            return
+        start = time.perf_counter()
+        try:
+            for tag in tags:
+                tag_key = self.tag_key(tag)
+                self.client.sadd(tag_key, key)
+                if ttl:
+                    self.client.expire(tag_key, ttl)
+        except Exception:  # pragma: no cover - instrumentation only
+            logger.exception("cache.tag failed key=%s tags=%s", key, tags)
+        finally:
+            self._record_metrics("tag", start)
+
+    def invalidate_tags(
+        self,
+        tags: Sequence[str],
+        *,
+        blackout: int = WRITE_BLACKOUT_SECONDS,
+        keys: Iterable[str] = (),
+    ) -> None:
+        """Delete every key registered under ``tags``, plus ``keys``.
+
+        Tagged writes are then refused for ``blackout`` seconds so a reader
+        that loaded rows before the invalidating commit cannot put them
+        back. Refresh locks are tag members too, so readers that locked
+        before the invalidation lose their lock and cannot write either.
+        Commands are pipelined: one round trip reads the tag sets and a
+        second deletes the keys and sets the blackout markers.
+        """
+
+        if not self.enabled or not tags:
+            return
+        tag_keys = [self.tag_key(tag) for tag in tags]
+        start = time.perf_counter()
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            doomed: set[str] = {*tag_keys, *keys}
+            for members in pipe.execute():
+                for member in members:
+                    if isinstance(member, bytes):
+                        member = member.decode("utf-8")
+                    doomed.add(member)
+            pipe.unlink(*doomed)
+            if blackout:
+                for tag_key in tag_keys:
+                    pipe.set(f"{tag_key}:blackout", "1", ex=blackout)
+            pipe.execute()
+        except Exception:  # pragma: no cover - instrumentation only
+            logger.exception("cache.invalidate_tags failed tags=%s", tags)
+        finally:
+            self._record_metrics("delete", start)
+
     def invalidate(self, *keys: str) -> None:
         if not self.enabled or not keys:
             return
@@ -177,31 +411,26 @@ class CacheService:
         finally:
             self._record_metrics("delete", start)
 
+    def invalidate_many(self, keys: Iterable[str]) -> None:
+        """Delete ``keys`` through one pipelined round trip."""
+
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        try:
+            self._delete_batched(keys)
+        except Exception:  # pragma: no cover - instrumentation only
+            logger.exception("cache.delete_many failed")
+        finally:
+            self._record_metrics("delete", start)
+
     def invalidate_prefix(self, prefix: str) -> None:
         if not self.enabled:
             return
         pattern = f"{prefix}" + ":*"
         start = time.perf_counter()
         try:
-            to_delete: list[str] = []
-            for key in self.client.scan_iter(match=pattern):
-                if isinstance(key, bytes):
-                    key = key.decode("utf-8")
-                to_delete.append(key)
-            if to_delete:
-                self.client.delete(*to_delete)
-        except AttributeError:  # pragma: no cover - fallback for stubs
-            client = self.client
-            store: MutableMapping[str, Any] | None = getattr(
-                client,
-                "store",
-                None,
-            )
-            if store is None:
-                return
-            keys = [key for key in store if key.startswith(prefix)]
-            for key in keys:
-                store.pop(key, None)
+            self._delete_batched(self.client.scan_iter(match=pattern))
         except Exception:  # pragma: no cover - instrumentation only
             logger.exception(
                 "cache.invalidate_prefix failed prefix=%s",
@@ -217,17 +446,35 @@ class CacheService:
         self.invalidate(self.profile_key(user_id))
 
     def invalidate_profiles(self, user_ids: Iterable[int]) -> None:
-        keys = [self.profile_key(user_id) for user_id in user_ids]
-        self.invalidate(*keys)
+        self.invalidate_many(self.profile_key(user_id) for user_id in user_ids)
+
+    def invalidate_profile_views(self, user_ids: Iterable[int]) -> None:
+        """Drop the given profiles and every ``DETAIL_TAG`` entry."""
+
+        self.invalidate_tags(
+            (DETAIL_TAG,),
+            keys=[self.profile_key(user_id) for user_id in user_ids],
+        )
+
+    def invalidate_user_collections(
+        self, *, profiles: Iterable[int] = ()
+    ) -> None:
+        """Drop cached listings and searches, and the given profiles."""
+
+        self.invalidate_tags(
+            COLLECTION_TAGS,
+            keys=[self.profile_key(user_id) for user_id in profiles],
+        )
 
-    def invalidate_user_collections(self) -> None:
-        self.invalidate_prefix(self.key("users", "list"))
-        self.invalidate_prefix(self.key("users", "search"))
+    def pending_invalidations(self) -> PendingInvalidations:
+        return PendingInvalidations(self)
 
     def build_hooks(self) -> CacheHooks:
         if self._hooks is None:
             self._hooks = CacheHooks(
-                invalidate_profile=self.invalidate_profile,
+                invalidate_profile=lambda user_id: (
+                    self.invalidate_profile_views((user_id,))
+                ),
                 invalidate_collections=self.invalidate_user_collections,
             )
         return self._hooks
@@ -236,15 +483,140 @@ class CacheService:
     # Internal helpers
     # ------------------------------------------------------------------
     def _hash_payload(self, payload: Mapping[str, object]) -> str:
-        serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-        return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+        # Cache keys need spread, not collision resistance against an
+        # attacker, so a fast non-cryptographic digest is enough.
+        return _digest(_canonical(payload))
+
+    def _delete_batched(self, keys: Iterable[str | bytes]) -> None:
+        """Pipeline ``UNLINK`` for ``keys`` in chunks of bounded size.
+
+        ``UNLINK`` frees the values off Redis' main thread, so dropping a
+        large set of keys does not stall other clients.
+        """
+
+        pipe = self.client.pipeline(transaction=False)
+        batch: list[str] = []
+        for key in keys:
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            batch.append(key)
+            if len(batch) == INVALIDATION_BATCH_SIZE:
+                pipe.unlink(*batch)
+                batch = []
+        if batch:
+            pipe.unlink(*batch)
+        pipe.execute()
+
+    def _in_blackout(self, tags: Sequence[str]) -> bool:
+        if not self.enabled:
+            return False
+        keys = [f"{self.tag_key(tag)}:blackout" for tag in tags]
+        try:
+            return bool(self.client.exists(*keys))
+        except Exception:  # pragma: no cover - instrumentation only
+            logger.exception("cache.exists failed keys=%s", keys)
+            return False
+
+    def _refresh_lock_key(self, key: str) -> str:
+        return f"{key}:refresh"
+
+    def _wait_for_fill(self, key: str) -> Any | None:
+        deadline = time.monotonic() + FILL_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(FILL_POLL_SECONDS)
+            envelope = self.get_json(key)
+            if isinstance(envelope, dict) and "payload" in envelope:
+                return envelope["payload"]
+        return None
+
+    def _acquire_refresh_lock(
+        self, key: str, tags: Sequence[str] = ()
+    ) -> bool:
+        """Try to take the refresh lock on ``key`` for this thread.
+
+        The lock key joins each of ``tags`` in the same transaction, so an
+        invalidation of any of them deletes the lock with the entries.
+        """
+
+        token = secrets.token_hex(8)
+        lock_key = self._refresh_lock_key(key)
+        start = time.perf_counter()
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.set(lock_key, token, nx=True, ex=REFRESH_LOCK_SECONDS)
+            for tag in tags:
+                pipe.sadd(self.tag_key(tag), lock_key)
+            acquired = pipe.execute()[0]
+        except Exception:  # pragma: no cover - instrumentation only
+            logger.exception("cache.lock failed key=%s", key)
+            return True
+        finally:
+            self._record_metrics("lock", start)
+        if acquired:
+            self._thread_locks()[key] = token
+        return bool(acquired)
+
+    def _release_refresh_lock(self, key: str, tags: Sequence[str]) -> None:
+        lock_key = self._refresh_lock_key(key)
+        start = time.perf_counter()
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.unlink(lock_key)
+            for tag in tags:
+                pipe.srem(self.tag_key(tag), lock_key)
+            pipe.execute()
+        except Exception:  # pragma: no cover - instrumentation only
+            logger.exception("cache.unlock failed key=%s", key)
+        finally:
+            self._record_metrics("delete", start)
+
+    def _holds_refresh_lock(self, key: str) -> bool:
+        """Return whether this thread still owns the refresh lock on ``key``.
+
+        The lock is forgotten locally either way; :meth:`set_swr` releases
+        it in Redis.
+        """
+
+        token = self._thread_locks().pop(key, None)
+        if token is None or not self.enabled:
+            return False
+        try:
+            current = self.client.get(self._refresh_lock_key(key))
+        except Exception:  # pragma: no cover - instrumentation only
+            logger.exception("cache.lock check failed key=%s", key)
+            return False
+        if isinstance(current, bytes):
+            current = current.decode("utf-8")
+        return current == token
+
+    def _thread_locks(self) -> dict[str, str]:
+        held = getattr(self._held_locks, "tokens", None)
+        if held is None:
+            held = self._held_locks.tokens = {}
+        return held
 
     def _record_metrics(self, operation: str, start: float | None) -> None:
-        _CACHE_OPERATIONS.labels(self.namespace, operation).inc()
+        counter = self._op_counters.get(operation)
+        if counter is None:
+            counter = self._op_counters[operation] = _CACHE_OPERATIONS.labels(
+                self.namespace, operation
+            )
+        counter.inc()
         if start is None:
             return
-        duration = time.perf_counter() - start
-        _CACHE_LATENCY.labels(self.namespace, operation).observe(duration)
+        latency = self._op_latency.get(operation)
+        if latency is None:
+            latency = self._op_latency[operation] = _CACHE_LATENCY.labels(
+                self.namespace, operation
+            )
+        latency.observe(time.perf_counter() - start)
 
 
-__all__ = ["CacheService", "CacheHooks"]
+__all__ = [
+    "CacheService",
+    "CacheHooks",
+    "PendingInvalidations",
+    "DETAIL_TAG",
+    "LISTING_TAG",
+    "SEARCH_TAG",
+]
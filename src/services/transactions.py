@@ -103,6 +103,12 @@ class TransactionManager:
 transaction_manager = TransactionManager()
 
 
+def active_session() -> Session | None:
+    """Return the session of the enclosing transactional scope, if any."""
+
+    return _active_session.get()
+
+
 @contextmanager
 def transactional_session(*, name: str = "transaction") -> Iterator[Session]:
     """Shortcut to open a transactional scope with instrumentation."""
@@ -112,6 +118,7 @@ def transactional_session(*, name: str = "transaction") -> Iterator[Session]:
 
 
 __all__ = [
+    "active_session",
     "transaction_manager",
     "transactional_session",
     "TransactionManager",
@@ -3,28 +3,57 @@
 from __future__ import annotations
 
 import os
-import time
+import tempfile
+from hashlib import blake2b
 from pathlib import Path
+from typing import BinaryIO, NamedTuple
 
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MiB
+# Largest multipart request that can still carry an acceptable photo.
+MAX_REQUEST_SIZE = MAX_FILE_SIZE + 64 * 1024
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def _process_umask() -> int:
+    # ``os.umask`` can only be read by setting it; do so once, at import.
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Staged files are created 0600; stored photos get the mode a plain
+# ``open`` would give them so other processes can serve them.
+PHOTO_FILE_MODE = 0o666 & ~_process_umask()
 
 
 class UploadError(ValueError):
     """Raised when an uploaded file is invalid."""
 
 
+class SavedPhoto(NamedTuple):
+    """Public URL of a stored photo and whether this call created it."""
+
+    url: str
+    created: bool
+
+
 def save_user_photo(
     file_storage: FileStorage,
     *,
     user_id: int,
     upload_folder: str,
     url_prefix: str = "/uploads",
-) -> str:
-    """Persist a user photo to disk and return its public URL."""
+) -> SavedPhoto:
+    """Persist a user photo to disk and return where it is served from.
+
+    Files are named after a digest of their content, so uploading the same
+    image again for a user reuses the stored file instead of writing a new
+    one; ``created`` is false in that case.
+    """
 
     filename = (file_storage.filename or "").strip()
     if not filename:
@@ -38,23 +67,63 @@ def save_user_photo(
     if ext not in ALLOWED_EXTENSIONS:
         raise UploadError("unsupported file type")
 
-    stream = file_storage.stream
-    if hasattr(stream, "seek") and hasattr(stream, "tell"):
-        current = stream.tell()
-        stream.seek(0, os.SEEK_END)
-        size = stream.tell()
-        stream.seek(current)
-        if size > MAX_FILE_SIZE:
-            raise UploadError("file too large")
+    # A declared part length is trusted for an early rejection only; the
+    # copy below enforces the limit on the bytes actually received.
+    if (file_storage.content_length or 0) > MAX_FILE_SIZE:
+        raise UploadError("file too large")
 
     upload_path = Path(upload_folder)
     upload_path.mkdir(parents=True, exist_ok=True)
 
-    unique_name = f"user-{user_id}-{int(time.time())}.{ext}"
+    # Stage the copy next to its final location so the rename is atomic.
+    digest = blake2b(digest_size=8)
+    with tempfile.NamedTemporaryFile(
+        dir=upload_path, prefix=".upload-", delete=False
+    ) as target:
+        staged = Path(target.name)
+        try:
+            _copy_limited(
+                file_storage.stream, target, limit=MAX_FILE_SIZE, digest=digest
+            )
+        except BaseException:
+            target.close()
+            staged.unlink(missing_ok=True)
+            raise
+
+    unique_name = f"user-{user_id}-{digest.hexdigest()}.{ext}"
     destination = upload_path / unique_name
-    file_storage.save(destination)
+    created = not destination.exists()
+    if created:
+        os.chmod(staged, PHOTO_FILE_MODE)
+        os.replace(staged, destination)
+    else:
+        staged.unlink(missing_ok=True)
 
     prefix = url_prefix.rstrip("/")
-    if prefix:
-        return f"{prefix}/{unique_name}"
-    return f"/{unique_name}"
+    return SavedPhoto(f"{prefix}/{unique_name}", created)
+
+
+def _copy_limited(
+    source: BinaryIO, target: BinaryIO, *, limit: int, digest=None
+) -> None:
+    """Copy ``source`` into ``target``, failing once ``limit`` is passed.
+
+    When ``digest`` is given it is fed every chunk that is written.
+    """
+
+    copied = 0
+    while chunk := source.read(COPY_BUFFER_SIZE):
+        copied += len(chunk)
+        if copied > limit:
+            raise UploadError("file too large")
+        if digest is not None:
+            digest.update(chunk)
+        target.write(chunk)
+
+
+def remove_user_photo(photo_url: str, *, upload_folder: str) -> None:
+    """Delete a photo stored by :func:`save_user_photo`, if present."""
+
+    name = photo_url.rsplit("/", 1)[-1]
+    if name:
+        (Path(upload_folder) / name).unlink(missing_ok=True)
@@ -0,0 +1,29 @@
+"""Helpers for parsing timestamps received in request payloads."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+try:  # pragma: no cover - optional C accelerator
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:  # pragma: no cover - stdlib fallback
+    _parse_datetime = None
+
+
+def parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, raising ``ValueError`` when invalid."""
+
+    if _parse_datetime is not None:  # pragma: no cover - optional path
+        try:
+            return _parse_datetime(value)
+        except ValueError as exc:
+            raise ValueError("invalid datetime format") from exc
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise ValueError("invalid datetime format") from exc
+
+
+__all__ = ["parse_iso_datetime"]
@@ -3,14 +3,13 @@
 from __future__ import annotations
 
 import base64
-import hashlib
 import hmac
-import json
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Iterable, List, Sequence
 
 from cryptography.fernet import Fernet, InvalidToken
+from orjson import dumps as _dumps, loads as _loads
 
 
 class EncryptionError(RuntimeError):
@@ -26,6 +25,12 @@ def _load_key(key: str) -> tuple[Fernet, bytes]:
     return fernet, raw
 
 
+def _hmac_sha256(key: bytes, message: bytes) -> str:
+    """Return the hex HMAC-SHA256 of ``message`` via the one-shot C path."""
+
+    return hmac.digest(key, message, "sha256").hex()
+
+
 @dataclass(slots=True)
 class ApplicationEncryptor:
     """Helper responsible for encrypting payloads and hashing tokens."""
@@ -76,64 +81,57 @@ class ApplicationEncryptor:
     def encrypt_text(self, value: str) -> str:
         """Encrypt textual data with the primary key."""
 
-        token = self._primary.encrypt(value.encode())
-        return token.decode()
+        return self._primary.encrypt(value.encode()).decode()
 
     def decrypt_text(self, value: str) -> str:
         """Attempt to decrypt a text payload using all configured keys."""
 
-        token = value.encode()
-        candidates = [self._primary, *self._fallbacks]
-        for fernet in candidates:
-            try:
-                return fernet.decrypt(token).decode()
-            except InvalidToken:
-                continue
-        raise EncryptionError("unable to decrypt payload with available keys")
+        return self._decrypt(value).decode()
 
     def encrypt_json(self, payload: dict[str, object] | list[object]) -> str:
         """Encrypt a JSON-serialisable payload."""
 
-        serialized = json.dumps(
-            payload, separators=(",", ":")
-        )
-        return self.encrypt_text(serialized)
+        return self._primary.encrypt(_dumps(payload)).decode()
 
     def decrypt_json(self, payload: str) -> object:
         """Decrypt a payload previously produced by :meth:`encrypt_json`."""
 
-        decrypted = self.decrypt_text(payload)
-        return json.loads(decrypted)
+        return _loads(self._decrypt(payload))
+
+    def _decrypt(self, value: str) -> bytes:
+        token = value.encode()
+        for fernet in (self._primary, *self._fallbacks):
+            try:
+                return fernet.decrypt(token)
+            except InvalidToken:
+                continue
+        raise EncryptionError("unable to decrypt payload with available keys")
 
     def hash_token(self, token: str) -> str:
         """Generate a deterministic digest for ``token``."""
 
-        digest = hmac.new(
-            self._primary_hash_key,
-            msg=token.encode(),
-            digestmod=hashlib.sha256,
-        )
-        return digest.hexdigest()
+        return _hmac_sha256(self._primary_hash_key, token.encode())
 
     def token_candidates(self, token: str) -> List[str]:
         """Return all possible digests for ``token`` across rotated keys."""
 
-        digests = [self.hash_token(token)]
-        for key in self._fallback_hash_keys:
-            digests.append(
-                hmac.new(
-                    key,
-                    msg=token.encode(),
-                    digestmod=hashlib.sha256,
-                ).hexdigest()
-            )
-        return digests
+        message = token.encode()
+        return [
+            _hmac_sha256(key, message)
+            for key in (self._primary_hash_key, *self._fallback_hash_keys)
+        ]
 
     def verify_token(self, token: str, expected: str) -> bool:
         """Return ``True`` if any rotated hash matches ``expected``."""
 
-        for digest in self.token_candidates(token):
-            if hmac.compare_digest(digest, expected):
+        # Only the exact lowercase hex form is accepted, as stored by
+        # ``hash_token``. Keys are tried in order, so the usual primary-key
+        # match costs a single HMAC.
+        expected_digest = expected.encode()
+        message = token.encode()
+        for key in (self._primary_hash_key, *self._fallback_hash_keys):
+            digest = _hmac_sha256(key, message).encode()
+            if hmac.compare_digest(digest, expected_digest):
                 return True
         return False
 
@@ -3,28 +3,34 @@
 from __future__ import annotations
 
 import json
+import re
+from functools import lru_cache
 from typing import Iterable
 
+from orjson import loads as _loads
+
+# A comma-separated item with surrounding whitespace excluded.
+_CSV_ITEM = re.compile(r"[^,\s](?:[^,]*[^,\s])?")
+
 
 def normalize_string_list(values: Iterable[str] | None) -> list[str]:
     """Normalize a collection of strings into a unique, ordered list."""
 
-    normalized: list[str] = []
-    seen: set[str] = set()
     if not values:
-        return normalized
-    for value in values:
-        if value is None:
-            continue
-        cleaned = value.strip()
-        if not cleaned:
-            continue
-        lowered = cleaned.lower()
-        if lowered in seen:
-            continue
-        normalized.append(lowered)
-        seen.add(lowered)
-    return normalized
+        return []
+    cleaned = (value.strip().lower() for value in values if value is not None)
+    return [value for value in dict.fromkeys(cleaned) if value]
+
+
+def split_string_list(raw: str) -> list[str]:
+    """Split a comma-separated string like :func:`normalize_string_list`.
+
+    Equivalent to ``normalize_string_list(raw.split(","))`` in one scan.
+    """
+
+    return list(
+        dict.fromkeys(match.lower() for match in _CSV_ITEM.findall(raw))
+    )
 
 
 def encode_string_list(values: Iterable[str] | None) -> str | None:
@@ -41,10 +47,18 @@ def decode_string_list(raw: str | None) -> list[str]:
 
     if not raw:
         return []
+    return list(_decode_cached(raw))
+
+
+@lru_cache(maxsize=4096)
+def _decode_cached(raw: str) -> tuple[str, ...]:
+    # Rows share a small vocabulary of skill and interest lists, so repeat
+    # values are common within and across pages. A tuple keeps the cached
+    # value immutable; callers get a fresh list.
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        return []
+        data = _loads(raw)
+    except ValueError:
+        return ()
     if isinstance(data, list):
-        return [str(item) for item in data if isinstance(item, str)]
-    return []
+        return tuple(str(item) for item in data if isinstance(item, str))
+    return ()
@@ -0,0 +1,7 @@
+"""WSGI entry point used by Gunicorn (``src.wsgi:app``)."""
+
+from __future__ import annotations
+
+from src.main import create_app
+
+app = create_app()
@@ -3,6 +3,8 @@
 import os
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
 
 os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
 os.environ.setdefault("SQLALCHEMY_ECHO", "false")
@@ -17,21 +19,41 @@ os.environ.setdefault(
     "APP_ENCRYPTION_KEY", "M-3-SHhAXx0eSuuomrMuvBHZkE6uNOA3y-38SWFz3qg="
 )
 
+import src.db.session as db_session  # noqa: E402
 from src.db.session import Base, get_engine, reset_engine  # noqa: E402
 from src.main import create_app  # noqa: E402
 import src.models.audit  # noqa: F401,E402
 
 
+def _begin_explicitly(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
 @pytest.fixture(scope="session")
-def app():
+def _engine():
+    # In-memory SQLite is served from one shared connection (StaticPool),
+    # so the schema built here persists for the whole session. Each
+    # pytest-xdist worker is its own process and gets its own database.
     reset_engine()
     engine = get_engine()
+    # pysqlite's implicit transaction handling breaks SAVEPOINT; let
+    # SQLAlchemy emit BEGIN itself so tests can roll back nested work.
+    raw = engine.raw_connection()
+    raw.driver_connection.isolation_level = None
+    raw.close()
+    event.listen(engine, "begin", _begin_explicitly)
     Base.metadata.create_all(bind=engine)
+    yield engine
+    event.remove(engine, "begin", _begin_explicitly)
+    Base.metadata.drop_all(bind=engine)
+    reset_engine()
+
+
+@pytest.fixture(scope="session")
+def app(_engine):
     application = create_app()
     application.config.update({"TESTING": True})
     yield application
-    Base.metadata.drop_all(bind=engine)
-    reset_engine()
 
 
 @pytest.fixture()
@@ -40,9 +62,30 @@ def client(app):
         yield client
 
 
+@pytest.fixture(scope="session")
+def _connection(_engine):
+    # Every session of the run joins one outer transaction on a single
+    # connection, turning their commits and rollbacks into savepoints.
+    connection = _engine.connect()
+    transaction = connection.begin()
+    factory = sessionmaker(
+        bind=connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(db_session, "_SessionFactory", factory)
+        yield connection
+    transaction.rollback()
+    connection.close()
+
+
 @pytest.fixture(autouse=True)
-def _db_cleanup():
-    engine = get_engine()
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    yield
+def _db_transaction(_connection):
+    # Rolling back to this savepoint discards whatever the test wrote,
+    # leaving data seeded by wider-scoped fixtures in place.
+    savepoint = _connection.begin_nested()
+    yield _connection
+    if savepoint.is_active:
+        savepoint.rollback()
@@ -1,17 +1,23 @@
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
-from unittest.mock import MagicMock
+from unittest.mock import Mock
 
 from src.db.session import session_scope
 from src.models.repositories import RepositoryError, UserRepository
+from src.models.repositories import _register_delegates
 from src.models.repositories.preferences import UserPreferenceRepository
 from src.models.repositories.sessions import UserSessionRepository
-from src.models.repositories.users import UserCoreRepository
+from src.models.repositories.users import (
+    UserCoreRepository,
+    search_clause,
+    skills_clause,
+)
 from src.models.user import User, UserPreference
 
 
 def test_set_preferences_updates_and_removes_entries():
-    session = MagicMock()
+    session = Mock()
     repo = UserPreferenceRepository(session)
     user = User(email="user@example.com")
 
@@ -35,7 +41,7 @@ def test_set_preferences_updates_and_removes_entries():
 
 
 def test_repository_error_on_integrity_failure_triggers_rollback():
-    session = MagicMock()
+    session = Mock()
     session.flush.side_effect = IntegrityError("stmt", {}, Exception("boom"))
     repo = UserSessionRepository(session)
     user = User(email="session@example.com")
@@ -48,7 +54,7 @@ def test_repository_error_on_integrity_failure_triggers_rollback():
 
 
 def test_user_repository_delegates_to_components(monkeypatch):
-    session = MagicMock()
+    session = Mock()
     repo = UserRepository(session)
 
     session.get.return_value = "user"
@@ -59,6 +65,18 @@ def test_user_repository_delegates_to_components(monkeypatch):
         getattr(repo, "nonexistent")
 
 
+def test_user_repository_builds_components_on_demand():
+    session = Mock()
+    repo = UserRepository(session)
+    assert repo._components == {}
+
+    repo.get(1)
+    assert list(repo._components) == [UserCoreRepository]
+    assert repo._component(UserCoreRepository) is repo._component(
+        UserCoreRepository
+    )
+
+
 def test_user_repository_allows_class_level_monkeypatch(monkeypatch):
     captured: list[int] = []
 
@@ -67,50 +85,49 @@ def test_user_repository_allows_class_level_monkeypatch(monkeypatch):
         return "patched"
 
     monkeypatch.setattr(UserRepository, "get", fake_get)
-    repo = UserRepository(MagicMock())
+    repo = UserRepository(Mock())
     assert repo.get(42) == "patched"
     assert captured == [42]
 
 
 def test_user_repository_getattr_delegation(monkeypatch):
     monkeypatch.delattr(UserRepository, "get")
-    session = MagicMock()
+    session = Mock()
     repo = UserRepository(session)
     session.get.return_value = "delegated"
     assert repo.get(5) == "delegated"
 
 
 def test_delegate_registration_branches():
-    import src.models.repositories as repo_module
-
-    UserCoreRepository.temp_value = 1
-    UserPreferenceRepository.temp_callable = lambda self: None
-    setattr(UserRepository, "temp_callable", lambda self: "existing")
-    removed_create_user = False
-    if hasattr(UserRepository, "create_user"):
-        delattr(UserRepository, "create_user")
-        removed_create_user = True
-
-    try:
-        for repository in repo_module._DELEGATED_REPOSITORIES:
-            for name, attr in repository.__dict__.items():
-                if name.startswith("_"):
-                    continue
-                if not callable(attr):
-                    continue
-                if hasattr(UserRepository, name):
-                    continue
-                setattr(UserRepository, name, repo_module._make_delegate(name))
-    finally:
-        delattr(UserCoreRepository, "temp_value")
-        delattr(UserPreferenceRepository, "temp_callable")
-        delattr(UserRepository, "temp_callable")
-        if removed_create_user:
-            setattr(
-                UserRepository,
-                "create_user",
-                repo_module._make_delegate("create_user"),
-            )
+    class ExtraRepository:
+        value = 1
+
+        def __init__(self, session, **_kwargs):
+            self.session = session
+
+        def _hidden(self):  # pragma: no cover - never delegated
+            return "hidden"
+
+        def existing(self):  # pragma: no cover - shadowed by the facade
+            return "component"
+
+        def extra(self, suffix):
+            return f"extra-{suffix}"
+
+    class Facade(UserRepository):
+        def existing(self):
+            return "facade"
+
+    _register_delegates(Facade, (ExtraRepository,))
+
+    assert "extra" in Facade.__dict__
+    assert "value" not in Facade.__dict__
+    assert "_hidden" not in Facade.__dict__
+    assert not hasattr(UserRepository, "extra")
+    repo = Facade(Mock())
+    assert repo.existing() == "facade"
+    assert repo.extra("x") == "extra-x"
+    assert list(repo._components) == [ExtraRepository]
 
 
 def test_bulk_import_users_creates_and_updates_records():
@@ -134,8 +151,8 @@ def test_bulk_import_users_creates_and_updates_records():
         ids = {user.id for user in created}
         assert len(ids) == 2
 
-    with session_scope() as session:
-        repo = UserRepository(session)
+        # Reload from the database rather than the identity map.
+        session.expire_all()
         updated = repo.bulk_import_users(
             [
                 {
@@ -157,3 +174,44 @@ def test_bulk_import_users_creates_and_updates_records():
         assert refreshed.location == "Berlin"
         third = repo.get_by_email("bulk-three@example.com")
         assert third is not None
+
+
+def test_exists_and_list_sessions_work_from_user_id():
+    with session_scope() as session:
+        repo = UserRepository(session)
+        user = repo.create_user(email="sessions@example.com")
+        repo.create_session(user, session_token="token-1")
+        user_id = user.id
+
+    with session_scope() as session:
+        repo = UserRepository(session)
+        assert repo.exists(user_id)
+        assert not repo.exists(user_id + 1)
+        records, total = repo.list_sessions(user_id)
+        assert total == 1
+        assert [record.user_id for record in records] == [user_id]
+        # Neither call should have put the user in the identity map.
+        assert all(not isinstance(obj, User) for obj in session)
+
+
+def test_search_clause_uses_text_vector_on_postgresql():
+    clause = search_clause("data engineer", "postgresql")
+    sql = str(clause.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("users.search_tsv @@ plainto_tsquery(")
+    assert "LIKE" not in sql
+
+    fallback = str(search_clause("data engineer", "sqlite"))
+    assert "users.search_tsv" not in fallback
+    assert fallback.count("LIKE") == 6
+
+
+def test_skills_clause_uses_single_containment_on_postgresql():
+    clause = skills_clause(["python", "flask"], "postgresql")
+    sql = str(clause.compile(dialect=postgresql.dialect()))
+    assert sql == (
+        "CAST(users.skills AS JSONB) @> CAST(%(param_1)s AS JSONB)"
+    )
+    assert clause.right.clause.value == '["python", "flask"]'
+
+    fallback = str(skills_clause(["python", "flask"], "sqlite"))
+    assert fallback.count("LIKE") == 2
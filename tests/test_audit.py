@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from src.db.session import session_scope
+from src.models.audit import AuditLog
+from src.services import audit as audit_module
+from src.services.audit import AuditEventQueue, log_audit_event
+from src.services.transactions import transactional_session
+
+
+def test_audit_queue_writes_events_in_batches():
+    batches: list[list[dict]] = []
+    audit_queue = AuditEventQueue(
+        batch_size=2, flush_interval=0.01, writer=batches.append
+    )
+    for index in range(5):
+        audit_queue.put({"event": f"e{index}"})
+    audit_queue.flush()
+    audit_queue.close()
+
+    assert all(1 <= len(batch) <= 2 for batch in batches)
+    events = [payload["event"] for batch in batches for payload in batch]
+    assert events == [f"e{index}" for index in range(5)]
+
+
+def test_audit_queue_close_drains_pending_events():
+    written: list[dict] = []
+    audit_queue = AuditEventQueue(
+        batch_size=10, flush_interval=60, writer=written.extend
+    )
+    audit_queue.put({"event": "late"})
+    audit_queue.close()
+    assert written == [{"event": "late"}]
+    audit_queue.close()
+
+
+def test_log_audit_event_uses_configured_queue(app):
+    queued: list[dict] = []
+
+    class _Queue:
+        put = staticmethod(queued.append)
+
+    app.extensions["audit_queue"] = _Queue()
+    try:
+        with app.test_request_context(headers={"User-Agent": "pytest"}):
+            log_audit_event("auth.test", actor="tester")
+    finally:
+        app.extensions.pop("audit_queue")
+
+    assert len(queued) == 1
+    assert queued[0]["event"] == "auth.test"
+    assert queued[0]["user_agent"] == "pytest"
+    assert queued[0]["created_at"].tzinfo is timezone.utc
+
+
+def test_write_batch_inserts_all_events():
+    stamp = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    audit_module._write_batch(
+        [
+            {"event": "batch.one", "details": {}, "created_at": stamp},
+            {"event": "batch.two", "details": {"n": 2}, "created_at": stamp},
+        ]
+    )
+    with session_scope() as session:
+        events = session.scalars(
+            select(AuditLog.event).order_by(AuditLog.event)
+        ).all()
+    assert events == ["batch.one", "batch.two"]
+
+
+def test_log_audit_event_joins_active_transaction(app):
+    queued: list[dict] = []
+
+    class _Queue:
+        put = staticmethod(queued.append)
+
+    app.extensions["audit_queue"] = _Queue()
+    try:
+        with app.app_context():
+            with transactional_session(name="test.outer") as session:
+                log_audit_event("audit.joined", actor="tester")
+                pending = session.scalars(
+                    select(AuditLog.event).where(
+                        AuditLog.event == "audit.joined"
+                    )
+                ).all()
+                assert pending == ["audit.joined"]
+    finally:
+        app.extensions.pop("audit_queue")
+
+    assert queued == []
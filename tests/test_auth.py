@@ -1,6 +1,7 @@
 """Tests for the authentication routes and repository."""
 
 import os
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -13,6 +14,25 @@ from src.models.repositories import RepositoryError, UserRepository
 from src.services.cache import CacheService
 
 
+LINKEDIN_PROFILE_PAYLOAD = {
+    "id": "ln123",
+    "localizedFirstName": "Ln",
+    "localizedLastName": "User",
+    "profilePicture": {
+        "displayImage~": {
+            "elements": [
+                {"identifiers": [{"identifier": "http://pic-ln"}]}
+            ]
+        }
+    },
+}
+LINKEDIN_EMAIL_PAYLOAD = {
+    "elements": [
+        {"handle~": {"emailAddress": "ln@example.com"}},
+    ]
+}
+
+
 class DummyResponse:
     def __init__(self, payload, status_code=200):
         self._payload = payload
@@ -63,12 +83,63 @@ def mock_fetch_user_info(provider, code, redirect_uri, nonce=None):
     raise AssertionError("unexpected provider")
 
 
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str | bytes] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    unlink = delete
+
+    def scan_iter(self, match=None):
+        keys = list(self.data.keys())
+        if match is None:
+            for key in keys:
+                yield key
+            return
+        if isinstance(match, str) and match.endswith("*"):
+            prefix = match[:-1]
+            for key in keys:
+                if key.startswith(prefix):
+                    yield key
+        elif match in self.data:
+            yield match
+
+
 @pytest.fixture
-def stubbed_google(monkeypatch):
+def fake_redis(client, monkeypatch):
+    """Serve the app's cache from a fresh :class:`FakeRedis`."""
+
+    redis = FakeRedis()
+    monkeypatch.setitem(
+        client.application.extensions,
+        "cache_service",
+        CacheService(redis, 60),
+    )
+    return redis
+
+
+@pytest.fixture
+def stubbed_auth_url(monkeypatch):
     monkeypatch.setattr(
         "src.routes.auth.build_auth_url",
         mock_build_auth_url,
     )
+
+
+@pytest.fixture
+def stubbed_google(monkeypatch, stubbed_auth_url):
     monkeypatch.setattr(
         "src.routes.auth.fetch_user_info",
         mock_fetch_user_info,
@@ -105,27 +176,10 @@ def test_google_flow(client, stubbed_google):
         assert verify_logs
 
 
-def test_linkedin_flow(client, monkeypatch):
-    monkeypatch.setattr("src.routes.auth.build_auth_url", mock_build_auth_url)
-
-    profile_payload = {
-        "id": "ln123",
-        "localizedFirstName": "Ln",
-        "localizedLastName": "User",
-        "profilePicture": {
-            "displayImage~": {
-                "elements": [
-                    {"identifiers": [{"identifier": "http://pic-ln"}]}
-                ]
-            }
-        },
-    }
-    email_payload = {
-        "elements": [
-            {"handle~": {"emailAddress": "ln@example.com"}},
-        ]
-    }
-    dummy_client = DummyLinkedInClient(profile_payload, email_payload)
+def test_linkedin_flow(client, monkeypatch, stubbed_auth_url):
+    dummy_client = DummyLinkedInClient(
+        LINKEDIN_PROFILE_PAYLOAD, LINKEDIN_EMAIL_PAYLOAD
+    )
 
     def fake_create_client(name):
         assert name == "linkedin"
@@ -164,7 +218,12 @@ def test_linkedin_flow(client, monkeypatch):
 
 def test_google_flow_with_custom_redirect(client, monkeypatch, stubbed_google):
     custom_redirect = "http://localhost/custom"
-    monkeypatch.setattr("src.routes.auth.ALLOWED_REDIRECTS", {custom_redirect})
+    app_config = client.application.config["APP_CONFIG"]
+    monkeypatch.setitem(
+        client.application.config,
+        "APP_CONFIG",
+        replace(app_config, allowed_redirects=frozenset({custom_redirect})),
+    )
 
     resp = client.post("/auth/google", json={"redirect_uri": custom_redirect})
     assert resp.status_code == 200
@@ -201,43 +260,7 @@ def test_profile_requires_token(client):
     assert resp.status_code == 401
 
 
-def test_profile_caching(monkeypatch, client):
-    class FakeRedis:
-        def __init__(self):
-            self.data: dict[str, str] = {}
-
-        def get(self, key):
-            return self.data.get(key)
-
-        def setex(self, key, ttl, value):
-            self.data[key] = value if isinstance(value, str) else str(value)
-
-        def set(self, key, value):
-            self.data[key] = value if isinstance(value, str) else str(value)
-
-        def delete(self, *keys):
-            for key in keys:
-                self.data.pop(key, None)
-
-        def scan_iter(self, match=None):
-            keys = list(self.data.keys())
-            if match is None:
-                for key in keys:
-                    yield key
-                return
-            if isinstance(match, str) and match.endswith("*"):
-                prefix = match[:-1]
-                for key in keys:
-                    if key.startswith(prefix):
-                        yield key
-            elif match in self.data:
-                yield match
-
-    fake_redis = FakeRedis()
-    app = client.application
-    previous_cache = app.extensions.get("cache_service")
-    app.extensions["cache_service"] = CacheService(fake_redis, 60)
-
+def test_profile_caching(monkeypatch, client, fake_redis):
     with session_scope() as session:
         repo = UserRepository(session)
         user = repo.upsert_oauth_user(
@@ -272,10 +295,6 @@ def test_profile_caching(monkeypatch, client):
         headers={"Authorization": "Bearer dummy"},
     )
     assert second.status_code == 200
-    if previous_cache is not None:
-        app.extensions["cache_service"] = previous_cache
-    else:
-        app.extensions.pop("cache_service", None)
 
 
 def test_profile_repository_error(monkeypatch, client):
@@ -320,12 +339,18 @@ def test_repository_helpers():
         assert not stored.is_active
 
 
-def test_verification_request_and_confirm(client):
+@pytest.fixture
+def verification_user():
+    """Return the id of a freshly created user to verify."""
+
     with session_scope() as session:
-        repo = UserRepository(session)
-        user = repo.create_user(email="verify@example.com")
-        user_id = user.id
+        return UserRepository(session).create_user(
+            email="verify@example.com"
+        ).id
 
+
+def test_verification_request_and_confirm(client, verification_user):
+    user_id = verification_user
     expires_at = (
         datetime.now(timezone.utc) + timedelta(minutes=5)
     ).isoformat()
@@ -365,12 +390,8 @@ def test_verification_request_and_confirm(client):
         assert any(log.details.get("success") for log in confirm_logs)
 
 
-def test_verification_rejects_wrong_code(client):
-    with session_scope() as session:
-        repo = UserRepository(session)
-        user = repo.create_user(email="wrong@example.com")
-        user_id = user.id
-
+def test_verification_rejects_wrong_code(client, verification_user):
+    user_id = verification_user
     request_resp = client.post(
         "/auth/verification/request",
         json={"user_id": user_id, "method": "email", "code": "222"},
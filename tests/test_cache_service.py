@@ -1,38 +1,117 @@
 from __future__ import annotations
 
-from src.services.cache import CacheService
+import json
+
+from src.services import cache as cache_module
+from src.services.cache import (
+    DETAIL_TAG,
+    LISTING_TAG,
+    SEARCH_TAG,
+    CacheService,
+)
+
+
+class StubPipeline:
+    """Queue commands and replay them against the stub on ``execute``."""
+
+    def __init__(self, client) -> None:
+        self._client = client
+        self._commands: list = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        self._client.round_trips += 1
+        commands, self._commands = self._commands, []
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
 
 
 class StubRedis:
     def __init__(self) -> None:
-        self.store: dict[str, str] = {}
+        self.store: dict[str, str | bytes] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.round_trips = 0
+        self.unlinked: list[str] = []
+        # Expiry deadlines on a fake clock that tests advance by hand.
+        self.now = 0.0
+        self.expiry: dict[str, float] = {}
+
+    def _live(self, key: str) -> bool:
+        deadline = self.expiry.get(key)
+        if deadline is not None and deadline <= self.now:
+            self.delete(key)
+        return key in self.store
 
     def get(self, key: str):
-        return self.store.get(key)
+        return self.store.get(key) if self._live(key) else None
 
     def setex(self, key: str, ttl: int, value: str) -> None:
         self.store[key] = value
+        self.expiry[key] = self.now + ttl
 
-    def set(self, key: str, value: str) -> None:
+    def set(
+        self,
+        key: str,
+        value: str,
+        nx: bool = False,
+        ex: int | None = None,
+    ) -> bool | None:
+        if nx and self._live(key):
+            return None
         self.store[key] = value
+        # Like Redis, a plain SET clears any previous expiry.
+        if ex:
+            self.expiry[key] = self.now + ex
+        else:
+            self.expiry.pop(key, None)
+        return True
 
     def delete(self, *keys: str) -> None:
         for key in keys:
             self.store.pop(key, None)
+            self.sets.pop(key, None)
+            self.expiry.pop(key, None)
+
+    def unlink(self, *keys: str) -> None:
+        self.unlinked.extend(keys)
+        self.delete(*keys)
+
+    def exists(self, *keys: str) -> int:
+        return sum(self._live(key) or key in self.sets for key in keys)
+
+    def sadd(self, key: str, *members: str) -> None:
+        self.sets.setdefault(key, set()).update(members)
+
+    def srem(self, key: str, *members: str) -> None:
+        self.sets.get(key, set()).difference_update(members)
+
+    def smembers(self, key: str) -> set[bytes]:
+        return {member.encode("utf-8") for member in self.sets.get(key, ())}
+
+    def expire(self, key: str, ttl: int) -> None:
+        pass
+
+    def pipeline(self, transaction: bool = True):
+        return StubPipeline(self)
 
     def scan_iter(self, match: str | None = None):
-        keys = list(self.store.keys())
+        # Snapshot only the matching keys; callers delete while iterating.
         if match is None:
-            for key in keys:
-                yield key.encode("utf-8")
-            return
-        if match.endswith("*"):
+            matches = list(self.store)
+        elif match.endswith("*"):
             prefix = match[:-1]
-            for key in keys:
-                if key.startswith(prefix):
-                    yield key.encode("utf-8")
-        elif match in self.store:
-            yield match.encode("utf-8")
+            matches = [key for key in self.store if key.startswith(prefix)]
+        else:
+            matches = [match] if match in self.store else []
+        for key in matches:
+            yield key.encode("utf-8")
 
 
 def test_cache_service_disabled_operations():
@@ -62,7 +141,7 @@ def test_cache_service_store_retrieve_and_invalidate():
     assert cache.get_json(listing_key) == {"items": [3]}
 
     cache.set_json(listing_key, {"items": [4]}, ttl=0)
-    assert redis.store[listing_key] == "{\"items\": [4]}"
+    assert json.loads(redis.store[listing_key]) == {"items": [4]}
 
     cache.invalidate_prefix(cache.key("users", "list"))
     assert listing_key not in redis.store
@@ -79,10 +158,250 @@ def test_cache_service_store_retrieve_and_invalidate():
         sort=("created_at", "desc"),
         filters={},
     )
-    cache.set_json(search_key, {"items": []})
+    cache.set_swr(search_key, {"items": []}, tags=(SEARCH_TAG,))
     hooks = cache.build_hooks()
     hooks.invalidate_collections()
     assert search_key not in redis.store
     cache.set_json(profile_key, {"id": 2})
     hooks.invalidate_profile(1)
     assert profile_key not in redis.store
+
+
+def test_cache_service_stale_while_revalidate(monkeypatch):
+    redis = StubRedis()
+    cache = CacheService(redis, 30, stale_ttl=60)
+    now = 1_000.0
+    monkeypatch.setattr(cache_module.time, "time", lambda: now)
+
+    assert cache.get_swr("listing") == (None, True)
+    cache.set_swr("listing", {"items": [1]})
+    assert cache.get_swr("listing") == ({"items": [1]}, False)
+
+    now += 31
+    assert cache.get_swr("listing") == ({"items": [1]}, True)
+    # Concurrent readers keep serving stale data while one refreshes.
+    assert cache.get_swr("listing") == ({"items": [1]}, False)
+
+    cache.set_swr("forever", {"items": []}, ttl=0)
+    now += 10_000
+    assert cache.get_swr("forever") == ({"items": []}, False)
+
+
+def test_cache_service_entries_and_refresh_locks_expire(monkeypatch):
+    redis = StubRedis()
+    cache = CacheService(redis, 30, stale_ttl=60)
+    monkeypatch.setattr(cache_module.time, "time", lambda: redis.now)
+
+    cache.set_swr("listing", {"items": [1]})
+    redis.now = 31
+    assert cache.get_swr("listing") == ({"items": [1]}, True)
+    assert cache.get_swr("listing") == ({"items": [1]}, False)
+
+    # A refresher that died gives up its lock once the lock expires.
+    redis.now += cache_module.REFRESH_LOCK_SECONDS
+    assert cache.get_swr("listing") == ({"items": [1]}, True)
+
+    # Past ttl + stale_ttl Redis has dropped the entry altogether.
+    redis.now = 90
+    assert cache.get_json("listing") is None
+    assert "listing" not in redis.store
+
+
+def test_cache_service_tag_invalidation_and_blackout():
+    redis = StubRedis()
+    cache = CacheService(redis, 30)
+
+    cache.set_swr("search", {"items": [1]}, tags=(SEARCH_TAG,))
+    cache.set_json("untagged", {"items": [2]})
+    assert redis.sets[cache.tag_key(SEARCH_TAG)] == {"search"}
+
+    cache.invalidate_tags([SEARCH_TAG])
+    assert "search" not in redis.store
+    assert "untagged" in redis.store
+    assert cache.tag_key(SEARCH_TAG) not in redis.sets
+
+    # Readers cannot repopulate the tag right after an invalidation.
+    cache.set_swr("search", {"items": [1]}, tags=(SEARCH_TAG,))
+    assert "search" not in redis.store
+
+
+def test_pending_invalidations_apply_on_flush():
+    redis = StubRedis()
+    cache = CacheService(redis, 30)
+    profile_key = cache.profile_key(7)
+    cache.set_json(profile_key, {"id": 7})
+    cache.set_swr("search", {"items": []}, tags=(SEARCH_TAG,))
+    cache.set_swr("full", {"items": []}, tags=(LISTING_TAG, DETAIL_TAG))
+
+    pending = cache.pending_invalidations()
+    pending.hooks.invalidate_profile(7)
+    assert profile_key in redis.store
+
+    redis.round_trips = 0
+    pending.flush()
+    assert profile_key not in redis.store
+    assert "full" not in redis.store
+    # Summary collections outlive writes that skip their columns.
+    assert "search" in redis.store
+    # Tag reads, then deletes plus blackout markers: two round trips.
+    assert redis.round_trips == 2
+
+    pending.hooks.invalidate_profile(7)
+    pending.hooks.invalidate_collections()
+    pending.flush()
+    assert "search" not in redis.store
+
+
+def test_invalidate_many_batches_deletes_in_one_round_trip(monkeypatch):
+    monkeypatch.setattr(cache_module, "INVALIDATION_BATCH_SIZE", 2)
+    redis = StubRedis()
+    cache = CacheService(redis, 30)
+    for user_id in range(5):
+        cache.set_json(cache.profile_key(user_id), {"id": user_id})
+    cache.set_json(cache.key("users", "list", "a"), {"items": []})
+
+    cache.invalidate_profiles(range(5))
+    assert list(redis.store) == [cache.key("users", "list", "a")]
+    assert redis.round_trips == 1
+
+    cache.invalidate_prefix(cache.key("users", "list"))
+    assert redis.store == {}
+    assert redis.round_trips == 2
+    assert len(redis.unlinked) == 6
+
+
+def test_listing_key_ignores_filter_order():
+    cache = CacheService(StubRedis(), 30)
+    first = cache.listing_key(
+        page=1,
+        per_page=20,
+        sort=("created_at", "desc"),
+        filters={"industry": "tech", "location": "Paris"},
+    )
+    second = cache.listing_key(
+        page=1,
+        per_page=20,
+        sort=("created_at", "desc"),
+        filters={"location": "Paris", "industry": "tech"},
+    )
+    assert first == second
+    assert first != cache.listing_key(
+        page=2,
+        per_page=20,
+        sort=("created_at", "desc"),
+        filters={"industry": "tech", "location": "Paris"},
+    )
+
+
+def test_get_swr_single_flight_fill(monkeypatch):
+    redis = StubRedis()
+    cache = CacheService(redis, 30)
+    sleeps: list[float] = []
+
+    def _winner_fills(seconds: float) -> None:
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            cache.set_swr("listing", {"items": [1]})
+
+    monkeypatch.setattr(cache_module.time, "sleep", _winner_fills)
+
+    # The first reader of a missing key builds it ...
+    assert cache.get_swr("listing") == (None, True)
+    # ... and later readers wait for its payload instead of querying.
+    assert cache.get_swr("listing") == ({"items": [1]}, False)
+    assert len(sleeps) == 2
+    assert "listing:refresh" not in redis.store
+
+
+def test_get_swr_waiters_give_up(monkeypatch):
+    redis = StubRedis()
+    cache = CacheService(redis, 30)
+    clock = [0.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(
+        cache_module.time,
+        "sleep",
+        lambda seconds: clock.__setitem__(0, clock[0] + seconds),
+    )
+
+    assert cache.get_swr("listing") == (None, True)
+    assert cache.get_swr("listing") == (None, True)
+    assert clock[0] >= cache_module.FILL_WAIT_SECONDS
+
+
+def test_get_swr_single_flight_fill_during_blackout(monkeypatch):
+    redis = StubRedis()
+    cache = CacheService(redis, 30)
+    cache.invalidate_tags([SEARCH_TAG])
+    sleeps: list[float] = []
+
+    def _winner_fills(seconds: float) -> None:
+        sleeps.append(seconds)
+        cache.set_swr("search", {"items": [1]}, tags=(SEARCH_TAG,))
+
+    monkeypatch.setattr(cache_module.time, "sleep", _winner_fills)
+
+    # One reader rebuilds the invalidated entry and may store it ...
+    assert cache.get_swr("search") == (None, True)
+    # ... while the others wait for it instead of querying themselves.
+    assert cache.get_swr("search") == ({"items": [1]}, False)
+    assert len(sleeps) == 1
+    assert "search:refresh" not in redis.store
+
+    # Writers that never took the refresh lock are still refused.
+    cache.invalidate_tags([SEARCH_TAG])
+    cache.set_swr("search", {"items": [2]}, tags=(SEARCH_TAG,))
+    assert "search" not in redis.store
+
+
+def test_blackout_refuses_fill_locked_before_invalidation():
+    redis = StubRedis()
+    cache = CacheService(redis, 30)
+    tags = (SEARCH_TAG,)
+
+    # A reader misses and takes the lock, then a commit invalidates the
+    # tag while it is still reading the old rows.
+    assert cache.get_swr("search", tags=tags) == (None, True)
+    cache.invalidate_user_collections()
+    cache.set_swr("search", {"items": ["old"]}, tags=tags)
+    assert "search" not in redis.store
+
+    # A reader that locks after the invalidation may fill the entry.
+    assert cache.get_swr("search", tags=tags) == (None, True)
+    cache.set_swr("search", {"items": ["new"]}, tags=tags)
+    assert cache.get_swr("search", tags=tags) == ({"items": ["new"]}, False)
+    assert redis.sets[cache.tag_key(SEARCH_TAG)] == {"search"}
+
+
+def test_end_refresh_releases_lock_after_failed_rebuild():
+    redis = StubRedis()
+    cache = CacheService(redis, 30)
+    tags = (SEARCH_TAG,)
+
+    assert cache.get_swr("search", tags=tags) == (None, True)
+    assert "search:refresh" in redis.store
+    # The rebuild raised: the lock is freed for the next reader.
+    cache.end_refresh("search", tags=tags)
+    assert "search:refresh" not in redis.store
+    assert redis.sets[cache.tag_key(SEARCH_TAG)] == set()
+    assert cache._thread_locks() == {}
+
+    assert cache.get_swr("search", tags=tags) == (None, True)
+    cache.set_swr("search", {"items": [1]}, tags=tags)
+    round_trips = redis.round_trips
+    cache.end_refresh("search", tags=tags)
+    assert redis.round_trips == round_trips
+
+
+def test_derived_keys_match_generic_key_builder():
+    cache = CacheService(StubRedis(), 30, namespace="ns")
+    assert cache.profile_key(7) == cache.key("users", "profile", 7)
+    listing = cache.listing_key(
+        page=1, per_page=20, sort=("created_at", "desc"), filters={}
+    )
+    search = cache.search_key(
+        query="ada", page=1, per_page=20, sort=("name", "asc"), filters={}
+    )
+    assert listing.startswith("ns:users:list:")
+    assert search.startswith("ns:users:search:")
+    assert listing == cache.key("users", "list", listing.rsplit(":", 1)[1])
@@ -1,17 +1,25 @@
+import base64
+import hashlib
+import hmac
+
 import pytest
+from cryptography.fernet import Fernet
 
 from src.config import get_config
 from src.utils.encryption import ApplicationEncryptor, EncryptionError
 
 
-def test_application_encryptor_roundtrip():
+@pytest.fixture(scope="module")
+def encryptor():
     config = get_config()
-    encryptor = ApplicationEncryptor.from_keys(
+    return ApplicationEncryptor.from_keys(
         primary_key=config.encryption_primary_key,
         fallback_keys=config.encryption_fallback_keys,
         rotation_days=config.encryption_rotation_days,
     )
 
+
+def test_application_encryptor_roundtrip(encryptor):
     secret = "sensitive-payload"
     token = encryptor.encrypt_text(secret)
     assert encryptor.decrypt_text(token) == secret
@@ -35,11 +43,44 @@ def test_encryptor_supports_fallback_keys():
     assert rotated_encryptor.verify_token("legacy", digest)
 
 
-def test_encryptor_invalid_token_behaviour():
-    config = get_config()
-    encryptor = ApplicationEncryptor.from_keys(
-        primary_key=config.encryption_primary_key
-    )
+def test_encryptor_invalid_token_behaviour(encryptor):
     with pytest.raises(EncryptionError):
         encryptor.decrypt_text("invalid-token")
     assert encryptor.requires_rotation("invalid-token") is True
+
+
+def test_hash_token_matches_stored_hmac_format(encryptor):
+    key = get_config().encryption_primary_key
+    raw_key = base64.urlsafe_b64decode(key.encode())
+    expected = hmac.new(raw_key, b"token", hashlib.sha256).hexdigest()
+
+    assert encryptor.hash_token("token") == expected
+    assert encryptor.token_candidates("token") == [expected]
+
+
+def test_verify_token_rejects_malformed_digest(encryptor):
+    assert not encryptor.verify_token("token", "not-hex")
+    assert not encryptor.verify_token("token", "")
+
+
+def test_verify_token_accepts_only_the_stored_hex_form(encryptor):
+    digest = encryptor.hash_token("token")
+    assert encryptor.verify_token("token", digest)
+    assert not encryptor.verify_token("token", digest.upper())
+    assert not encryptor.verify_token("token", f" {digest}")
+    assert not encryptor.verify_token("token", f"{digest[:2]} {digest[2:]}")
+    assert not encryptor.verify_token("token", "é" * 64)
+
+
+def test_encrypt_json_roundtrip_across_rotation(encryptor):
+    primary = get_config().encryption_primary_key
+    old = encryptor
+    payload = {"device": "laptop", "scopes": ["read", "write"], "n": 1}
+    encrypted = old.encrypt_json(payload)
+
+    rotated = ApplicationEncryptor.from_keys(
+        primary_key=Fernet.generate_key().decode(),
+        fallback_keys=[primary],
+    )
+    assert rotated.decrypt_json(encrypted) == payload
+    assert rotated.decrypt_text(old.encrypt_text("été")) == "été"
@@ -0,0 +1,42 @@
+"""Tests for the string list helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.utils.lists import (
+    decode_string_list,
+    encode_string_list,
+    normalize_string_list,
+    split_string_list,
+)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "python,Flask, python ,,  ",
+        "c++, c#,go lang,Go Lang",
+        " a ",
+        "",
+        ",,,",
+        "x,\ty\n, z",
+    ],
+)
+def test_split_string_list_matches_normalize(raw):
+    assert split_string_list(raw) == normalize_string_list(raw.split(","))
+
+
+def test_normalize_string_list_keeps_first_spelling_order():
+    values = [" Python", None, "flask", "", "PYTHON ", "Go"]
+    assert normalize_string_list(values) == ["python", "flask", "go"]
+    assert normalize_string_list(None) == []
+
+
+def test_decode_string_list_returns_independent_lists():
+    raw = encode_string_list(["Python", "flask"])
+    first = decode_string_list(raw)
+    first.append("mutated")
+    assert decode_string_list(raw) == ["python", "flask"]
+    assert decode_string_list("not json") == []
+    assert decode_string_list('{"a": 1}') == []
@@ -2,7 +2,10 @@
 
 from datetime import datetime
 
+import pytest
+
 from src.config import reset_config
+from src import main as main_module
 from src.main import create_app
 
 
@@ -15,11 +18,30 @@ def test_health(client):
     assert timestamp.tzinfo is not None
 
 
+def test_health_timestamp_is_rebuilt_once_per_second(monkeypatch):
+    clock = iter([1_800_000_000.1, 1_800_000_000.9, 1_800_000_001.2])
+    monkeypatch.setattr(main_module, "_health_stamp", (-1, ""))
+    monkeypatch.setattr(main_module.time, "time", lambda: next(clock))
+
+    first = main_module._health_timestamp()
+    assert main_module._health_timestamp() is first
+    later = main_module._health_timestamp()
+
+    assert first == "2027-01-15T08:00:00+00:00"
+    assert later == "2027-01-15T08:00:01+00:00"
+
+
 def test_users_endpoint(client):
     response = client.get("/users")
     assert response.status_code == 200
     body = response.get_json()
-    assert body == {"items": [], "page": 1, "per_page": 20, "total": 0}
+    assert body == {
+        "items": [],
+        "page": 1,
+        "per_page": 20,
+        "has_next": False,
+        "total": 0,
+    }
 
 
 def test_not_found(client):
@@ -34,32 +56,52 @@ def test_cors_headers(client):
     assert response.headers["Access-Control-Allow-Origin"] == "*"
 
 
-def test_custom_cors_origin_allowed():
+@pytest.fixture(scope="module")
+def restricted_cors_client():
+    # CORS origins are read once by create_app, so the override can be
+    # undone as soon as the app exists.
     reset_config({"CORS_ORIGINS": "https://allowed.example"})
     try:
-        app = create_app()
-        app.config.update({"TESTING": True})
-        with app.test_client() as client:
-            response = client.get(
-                "/health", headers={"Origin": "https://allowed.example"}
-            )
-            assert (
-                response.headers["Access-Control-Allow-Origin"]
-                == "https://allowed.example"
-            )
+        restricted = create_app()
     finally:
         reset_config({"CORS_ORIGINS": None})
+    restricted.config.update({"TESTING": True})
+    with restricted.test_client() as client:
+        yield client
 
 
-def test_custom_cors_origin_rejected():
-    reset_config({"CORS_ORIGINS": "https://allowed.example"})
+def test_custom_cors_origin_allowed(restricted_cors_client):
+    response = restricted_cors_client.get(
+        "/health", headers={"Origin": "https://allowed.example"}
+    )
+    assert (
+        response.headers["Access-Control-Allow-Origin"]
+        == "https://allowed.example"
+    )
+
+
+def test_custom_cors_origin_rejected(restricted_cors_client):
+    response = restricted_cors_client.get(
+        "/health", headers={"Origin": "https://other.example"}
+    )
+    assert "Access-Control-Allow-Origin" not in response.headers
+
+
+def test_wsgi_entry_point_exposes_app():
+    from src import wsgi
+
+    with wsgi.app.test_client() as client:
+        assert client.get("/health").status_code == 200
+
+
+def test_allowed_redirects_are_parsed_from_env():
     try:
-        app = create_app()
-        app.config.update({"TESTING": True})
-        with app.test_client() as client:
-            response = client.get(
-                "/health", headers={"Origin": "https://other.example"}
-            )
-            assert "Access-Control-Allow-Origin" not in response.headers
+        config = reset_config(
+            {"ALLOWED_REDIRECTS": " https://a.example/cb , ,https://b.example"}
+        )
+        assert config.allowed_redirects == {
+            "https://a.example/cb",
+            "https://b.example",
+        }
     finally:
-        reset_config({"CORS_ORIGINS": None})
+        reset_config({"ALLOWED_REDIRECTS": None})
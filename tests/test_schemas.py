@@ -0,0 +1,209 @@
+"""Tests for the precompiled schema dumpers and loaders."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from marshmallow import INCLUDE, Schema, ValidationError, fields, post_dump
+from marshmallow import pre_dump, validates
+from marshmallow.decorators import POST_DUMP, POST_LOAD, PRE_LOAD
+
+from src.db.session import session_scope
+from src.models.repositories import UserRepository
+from src.routes import users as user_routes
+from src.schemas.fast import compile_dumper, compile_loader
+from src.schemas.user import UserSchema, UserUpdateSchema
+
+
+def test_compiled_dumper_matches_schema_dump():
+    with session_scope() as session:
+        repo = UserRepository(session)
+        user = repo.create_user(
+            email="fast@example.com",
+            name="Fast",
+            skills=["python"],
+            interests=["chess"],
+        )
+        repo.set_preferences(user, {"theme": "dark"})
+        repo.record_activity(user, activity_type="login", score_delta=1)
+        other = repo.create_user(email="other@example.com")
+
+        single = UserSchema()
+        many = UserSchema(many=True)
+        assert compile_dumper(single)(user) == single.dump(user)
+        assert compile_dumper(many)([user, other]) == many.dump(
+            [user, other]
+        )
+
+
+def test_route_dumpers_match_schema_dump():
+    # fast.py leans on marshmallow internals; check every route dumper
+    # against the public API on a profile with each relation populated.
+    with session_scope() as session:
+        repo = UserRepository(session)
+        user = repo.upsert_oauth_user(
+            email="parity@example.com",
+            provider="linkedin",
+            provider_user_id="li-1",
+            name="Parity",
+            title="Engineer",
+            last_login=datetime(2024, 1, 2, tzinfo=timezone.utc),
+            social_profile_url="https://linkedin.example/parity",
+        )
+        repo.update_user(
+            user,
+            {
+                "skills": ["python"],
+                "experience_years": 4,
+                "privacy_settings": {"show_email": False},
+                "active_tokens": ["token"],
+            },
+        )
+        repo.set_preferences(user, {"theme": "dark"})
+        repo.record_activity(user, activity_type="login", score_delta=2)
+        repo.create_verification(user, method="email", code="123456")
+        repo.create_connection(
+            user,
+            connection_type="linkedin",
+            external_reference="ref",
+            attributes={"weight": 1},
+        )
+        repo.create_session(
+            user,
+            session_token="session-token",
+            ip_address="127.0.0.1",
+            expires_at=datetime(2030, 1, 1, tzinfo=timezone.utc),
+        )
+        bare = repo.create_user(email="bare@example.com")
+        users = [user, bare]
+
+        cases = [
+            (user_routes.dump_users, user_routes.users_schema, users),
+            (
+                user_routes.dump_listing_users,
+                user_routes.listing_users_schema,
+                users,
+            ),
+            (
+                user_routes.dump_activities,
+                user_routes.activities_schema,
+                user.activities,
+            ),
+            (
+                user_routes.dump_sessions,
+                user_routes.sessions_schema,
+                user.sessions,
+            ),
+            (
+                user_routes.dump_connections,
+                user_routes.connections_schema,
+                user.connections,
+            ),
+        ]
+        for dump, schema, objs in cases:
+            assert objs
+            assert dump(objs) == schema.dump(objs)
+
+
+def test_compiled_dumper_runs_hooks_and_skips_missing():
+    class Point:
+        def __init__(self, x):
+            self.x = x
+
+    class PointSchema(Schema):
+        x = fields.Integer()
+        y = fields.Integer()
+
+        @pre_dump
+        def _double(self, obj, **_):
+            return Point(obj.x * 2)
+
+        @post_dump
+        def _label(self, data, **_):
+            data["label"] = f"p{data['x']}"
+            return data
+
+    dump = compile_dumper(PointSchema())
+    assert dump(Point(2)) == {"x": 4, "label": "p4"}
+    dump_many = compile_dumper(PointSchema(many=True))
+    assert dump_many([Point(1), Point(3)]) == [
+        {"x": 2, "label": "p2"},
+        {"x": 6, "label": "p6"},
+    ]
+
+
+def test_compiled_dumper_reads_mappings_through_accessor():
+    class PairSchema(Schema):
+        left = fields.String()
+        right = fields.String(data_key="r")
+
+    dump = compile_dumper(PairSchema())
+    assert dump({"left": "a", "right": "b"}) == {"left": "a", "r": "b"}
+    assert dump({"left": "a"}) == {"left": "a"}
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"title": "Engineer", "skills": ["Python", "python", " Go "]},
+        {"linkedin_url": "", "active_tokens": ["a", " a ", "b"]},
+        {},
+        {"name": "", "experience_years": "many", "bogus": 1},
+        {"privacy_settings": {"": True}},
+        {"skills": ["a", 1], "interests": "chess"},
+        {"email": "ignored@example.com", "is_active": "yes"},
+        ["not", "a", "dict"],
+    ],
+)
+def test_compiled_loader_matches_schema_load(payload):
+    schema = UserUpdateSchema()
+    load = compile_loader(schema)
+    try:
+        expected = schema.load(payload)
+    except ValidationError as exc:
+        with pytest.raises(ValidationError) as excinfo:
+            load(payload)
+        assert excinfo.value.messages == exc.messages
+    else:
+        assert load(payload) == expected
+
+
+def test_compiled_loader_falls_back_for_unsupported_schemas():
+    class FieldValidated(Schema):
+        x = fields.Integer()
+
+        @validates("x")
+        def _check(self, value):  # pragma: no cover - never invoked
+            pass
+
+    many = UserUpdateSchema(many=True)
+    include = UserUpdateSchema(unknown=INCLUDE)
+    validated = FieldValidated()
+    assert compile_loader(many) == many.load
+    assert compile_loader(include) == include.load
+    assert compile_loader(validated) == validated.load
+
+
+def test_update_schema_normalizes_fields_without_hooks():
+    schema = UserUpdateSchema()
+    assert not schema._has_processors(PRE_LOAD)
+    assert not schema._has_processors(POST_LOAD)
+    assert not UserSchema()._has_processors(POST_DUMP)
+    loaded = schema.load(
+        {
+            "linkedin_url": "",
+            "skills": ["Python", " python ", "Go"],
+            "interests": None,
+            "active_tokens": [" a ", "a", "b"],
+        }
+    )
+    assert loaded == {
+        "linkedin_url": None,
+        "skills": ["python", "go"],
+        "interests": None,
+        "active_tokens": ["a", "b"],
+    }
+    with pytest.raises(ValidationError) as excinfo:
+        schema.load({"linkedin_url": "not a url"})
+    assert "linkedin_url" in excinfo.value.messages
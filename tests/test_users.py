@@ -4,36 +4,94 @@ from __future__ import annotations
 
 import io
 import os
-import tempfile
+import stat
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from src.db.session import session_scope
+from src.db.session import get_engine, session_scope
 from src.models.audit import AuditLog
 from src.models.repositories import RepositoryError, UserRepository
 from src.services.cache import CacheService
-from sqlalchemy import select
+from src.services.uploads import MAX_FILE_SIZE, MAX_REQUEST_SIZE
+from sqlalchemy import event, select
+
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"0" * 16
+
+
+class DummyPipeline:
+    """Queue commands and replay them against the stub on ``execute``."""
+
+    def __init__(self, client) -> None:
+        self._client = client
+        self._commands: list = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        self._client.round_trips += 1
+        commands, self._commands = self._commands, []
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
 
 
 class DummyRedis:
     """Minimal Redis-like interface for testing cache invalidation."""
 
     def __init__(self):
-        self.store: dict[str, str] = {}
+        self.store: dict[str, str | bytes] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.round_trips = 0
 
     def get(self, key: str):
         return self.store.get(key)
 
-    def setex(self, key: str, ttl: int, value: object):
-        self.store[key] = value if isinstance(value, str) else str(value)
-
-    def set(self, key: str, value: object):
-        self.store[key] = value if isinstance(value, str) else str(value)
+    def setex(self, key: str, ttl: int, value: str | bytes):
+        self.store[key] = value
+
+    def set(
+        self,
+        key: str,
+        value: str | bytes,
+        nx: bool = False,
+        ex: int | None = None,
+    ):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
 
     def delete(self, *keys: str):
         for key in keys:
             self.store.pop(key, None)
+            self.sets.pop(key, None)
+
+    unlink = delete
+
+    def exists(self, *keys: str):
+        return sum(key in self.store for key in keys)
+
+    def sadd(self, key: str, *members: str):
+        self.sets.setdefault(key, set()).update(members)
+
+    def srem(self, key: str, *members: str):
+        self.sets.get(key, set()).difference_update(members)
+
+    def smembers(self, key: str):
+        return set(self.sets.get(key, ()))
+
+    def expire(self, key: str, ttl: int):
+        pass
+
+    def pipeline(self, transaction: bool = True):
+        return DummyPipeline(self)
 
     def scan_iter(self, match: str | None = None):
         keys = list(self.store.keys())
@@ -50,38 +108,73 @@ class DummyRedis:
             yield match
 
 
-@pytest.fixture
-def seeded_users():
+@pytest.fixture(scope="module")
+def seeded_users(_connection):
+    """Seed three users once per module and return their ids.
+
+    The users live in a savepoint that outlasts each test's own, so tests
+    share them while still rolling back their changes.
+    """
+
+    savepoint = _connection.begin_nested()
     with session_scope() as session:
-        repo = UserRepository(session)
-        alice = repo.create_user(
-            email="alice@example.com",
-            name="Alice",
-            industry="Technology",
-            location="Paris",
-            experience_years=5,
-            title="Platform Engineer",
-            skills=["python", "flask"],
-            interests=["networking"],
+        alice, bob, carol = UserRepository(session).bulk_import_users(
+            [
+                {
+                    "email": "alice@example.com",
+                    "name": "Alice",
+                    "industry": "Technology",
+                    "location": "Paris",
+                    "experience_years": 5,
+                    "title": "Platform Engineer",
+                    "skills": ["python", "flask"],
+                    "interests": ["networking"],
+                },
+                {
+                    "email": "bob@example.com",
+                    "name": "Bob",
+                    "industry": "Finance",
+                    "location": "London",
+                    "experience_years": 8,
+                    "skills": ["excel", "python"],
+                },
+                {
+                    "email": "carol@example.com",
+                    "name": "Carol",
+                    "industry": "Technology",
+                    "location": "Paris",
+                    "experience_years": 2,
+                    "skills": ["javascript"],
+                    "bio": "Enthusiastic engineer",
+                },
+            ]
         )
-        bob = repo.create_user(
-            email="bob@example.com",
-            name="Bob",
-            industry="Finance",
-            location="London",
-            experience_years=8,
-            skills=["excel", "python"],
-        )
-        carol = repo.create_user(
-            email="carol@example.com",
-            name="Carol",
-            industry="Technology",
-            location="Paris",
-            experience_years=2,
-            skills=["javascript"],
-            bio="Enthusiastic engineer",
-        )
-        yield {"alice": alice, "bob": bob, "carol": carol}
+        ids = {"alice": alice.id, "bob": bob.id, "carol": carol.id}
+    yield ids
+    savepoint.rollback()
+
+
+@pytest.fixture
+def fake_redis(client, monkeypatch):
+    """Serve the app's cache from a fresh :class:`DummyRedis`."""
+
+    redis = DummyRedis()
+    monkeypatch.setitem(
+        client.application.extensions,
+        "cache_service",
+        CacheService(redis, 60),
+    )
+    return redis
+
+
+@pytest.fixture
+def upload_folder(client, tmp_path, monkeypatch):
+    """Point the app's uploads at this test's empty ``tmp_path``."""
+
+    monkeypatch.setitem(
+        client.application.config, "UPLOAD_FOLDER", str(tmp_path)
+    )
+    return tmp_path
 
 
 def test_list_users_with_filters(client, seeded_users):
@@ -101,32 +194,184 @@ def test_list_users_with_filters(client, seeded_users):
     assert payload["items"][0]["skills"] == ["python", "flask"]
 
 
-def test_list_users_uses_cache(client, seeded_users, monkeypatch):
-    app = client.application
-    fake_cache = DummyRedis()
-    previous_cache = app.extensions.get("cache_service")
-    app.extensions["cache_service"] = CacheService(fake_cache, 60)
-    try:
-        first = client.get("/users", query_string={"page": 1, "per_page": 2})
-        assert first.status_code == 200
-        assert fake_cache.store  # cache populated
+def test_list_users_returns_summary_unless_full(client, seeded_users):
+    summary = client.get("/users").get_json()["items"][0]
+    assert "preferences" not in summary
+    assert "active_tokens" not in summary
+    assert {"id", "email", "skills"} <= set(summary)
 
-        def _fail(*_args, **_kwargs):  # pragma: no cover - should not run
-            raise AssertionError("repository executed despite cache")
+    full = client.get("/users", query_string={"fields": "full"})
+    item = full.get_json()["items"][0]
+    assert "preferences" in item
+    assert "sessions" in item
 
-        monkeypatch.setattr("src.routes.users._execute_user_repo", _fail)
-        second = client.get("/users", query_string={"page": 1, "per_page": 2})
-        assert second.status_code == 200
-        assert second.get_json() == first.get_json()
+
+def test_list_users_query_count_is_bounded(client, seeded_users):
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        assert client.get("/users").status_code == 200
+        summary_queries = len(statements)
+        statements.clear()
+        assert client.get(
+            "/users", query_string={"fields": "full"}
+        ).status_code == 200
+        full_queries = len(statements)
     finally:
-        if previous_cache is not None:
-            app.extensions["cache_service"] = previous_cache
-        else:
-            app.extensions.pop("cache_service", None)
+        event.remove(engine, "before_cursor_execute", _record)
+
+    # The page carries its own total; full documents add one IN query per
+    # collection.
+    assert summary_queries == 1
+    assert full_queries == 1 + 6
+
+
+def test_list_users_without_count(client, seeded_users):
+    first = client.get(
+        "/users", query_string={"count": "none", "per_page": 2}
+    )
+    assert first.status_code == 200
+    body = first.get_json()
+    assert "total" not in body
+    assert body["has_next"] is True
+    assert len(body["items"]) == 2
+
+    last = client.get(
+        "/users", query_string={"count": "none", "per_page": 2, "page": 2}
+    ).get_json()
+    assert last["has_next"] is False
+    assert len(last["items"]) == 1
+
+    exact = client.get("/users", query_string={"per_page": 2}).get_json()
+    assert exact["total"] == 3
+    assert exact["has_next"] is True
+
+    invalid = client.get("/users", query_string={"count": "estimate"})
+    assert invalid.status_code == 400
+
+
+@pytest.mark.parametrize(
+    ("per_page", "status", "expected"),
+    [
+        ("2", 200, 2),
+        (" 2 ", 200, 2),
+        ("02", 200, 2),
+        ("0", 400, None),
+        ("101", 400, None),
+        ("two", 400, None),
+    ],
+)
+def test_list_users_per_page_parsing(
+    client, seeded_users, per_page, status, expected
+):
+    response = client.get("/users", query_string={"per_page": per_page})
+    assert response.status_code == status
+    if expected is not None:
+        assert response.get_json()["per_page"] == expected
+
+
+def test_search_users_past_last_page_keeps_total(client, seeded_users):
+    response = client.get(
+        "/users/search", query_string={"q": "python", "page": 9}
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["items"] == []
+    assert body["total"] == 2
+    assert body["has_next"] is False
+
+
+def test_list_users_uses_cache(
+    client, seeded_users, monkeypatch, fake_redis
+):
+    first = client.get("/users", query_string={"page": 1, "per_page": 2})
+    assert first.status_code == 200
+    assert fake_redis.store  # cache populated
+
+    def _fail(*_args, **_kwargs):  # pragma: no cover - should not run
+        raise AssertionError("repository executed despite cache")
+
+    monkeypatch.setattr("src.routes.users._execute_user_repo", _fail)
+    second = client.get("/users", query_string={"page": 1, "per_page": 2})
+    assert second.status_code == 200
+    assert second.get_json() == first.get_json()
+
+
+def test_list_users_waits_for_concurrent_fill(
+    client, seeded_users, monkeypatch, fake_redis
+):
+    first = client.get("/users")
+    (listing_key,) = (
+        key for key in fake_redis.store if ":users:list:" in key
+    )
+    envelope = fake_redis.store.pop(listing_key)
+    # Another worker holds the refresh lock and fills the entry meanwhile.
+    fake_redis.store[f"{listing_key}:refresh"] = "other-worker"
+    monkeypatch.setattr(
+        "src.services.cache.time.sleep",
+        lambda _seconds: fake_redis.store.setdefault(listing_key, envelope),
+    )
+
+    def _fail(*_args, **_kwargs):  # pragma: no cover - should not run
+        raise AssertionError("repository executed despite pending fill")
+
+    monkeypatch.setattr("src.routes.users._execute_user_repo", _fail)
+    second = client.get("/users")
+    assert second.status_code == 200
+    assert second.get_json() == first.get_json()
+
+
+def test_list_users_releases_refresh_lock_on_error(
+    client, seeded_users, monkeypatch, fake_redis
+):
+    monkeypatch.setattr(
+        "src.routes.users._execute_user_repo",
+        lambda *_args: (None, ("unavailable", 503)),
+    )
+    response = client.get("/users")
+    assert response.status_code == 503
+    assert not any(key.endswith(":refresh") for key in fake_redis.store)
+    assert not any(
+        key.endswith(":refresh")
+        for members in fake_redis.sets.values()
+        for key in members
+    )
+
+
+def test_user_writes_invalidate_cached_listing(
+    client, seeded_users, fake_redis
+):
+    def _listing_keys() -> set[str]:
+        return {key for key in fake_redis.store if ":users:list:" in key}
+
+    client.get("/users")
+    summary = _listing_keys()
+    client.get("/users", query_string={"fields": "full"})
+    full = _listing_keys() - summary
+    assert full and summary
+
+    alice_id = seeded_users["alice"]
+    response = client.put(
+        f"/users/{alice_id}/preferences",
+        json={"preferences": {"theme": "dark"}},
+    )
+    assert response.status_code == 200
+    assert not any(key in fake_redis.store for key in full)
+    assert all(key in fake_redis.store for key in summary)
+
+    response = client.put(f"/users/{alice_id}", json={"title": "CTO"})
+    assert response.status_code == 200
+    assert not any(key in fake_redis.store for key in summary)
 
 
 def test_get_user_returns_profile(client, seeded_users):
-    alice_id = seeded_users["alice"].id
+    alice_id = seeded_users["alice"]
     response = client.get(f"/users/{alice_id}")
     assert response.status_code == 200
     body = response.get_json()
@@ -134,8 +379,52 @@ def test_get_user_returns_profile(client, seeded_users):
     assert body["user"]["industry"] == "Technology"
 
 
+def test_get_user_uses_profile_cache(
+    client, seeded_users, monkeypatch, fake_redis
+):
+    alice_id = seeded_users["alice"]
+    first = client.get(f"/users/{alice_id}")
+    assert first.status_code == 200
+    profile_key = client.application.extensions[
+        "cache_service"
+    ].profile_key(alice_id)
+    assert profile_key in fake_redis.store
+
+    with monkeypatch.context() as patch:
+        def _fail(*_args, **_kwargs):  # pragma: no cover - not run
+            raise AssertionError("repository executed despite cache")
+
+        patch.setattr("src.routes.users._execute_user_repo", _fail)
+        second = client.get(f"/users/{alice_id}")
+        assert second.get_json() == first.get_json()
+
+    client.put(f"/users/{alice_id}", json={"title": "Staff Engineer"})
+    assert profile_key not in fake_redis.store
+    third = client.get(f"/users/{alice_id}")
+    assert third.get_json()["user"]["title"] == "Staff Engineer"
+
+
+def test_get_user_honours_etag(client, seeded_users):
+    alice_id = seeded_users["alice"]
+    first = client.get(f"/users/{alice_id}")
+    etag = first.headers["ETag"]
+
+    cached = client.get(
+        f"/users/{alice_id}", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    client.put(f"/users/{alice_id}", json={"title": "Staff Engineer"})
+    changed = client.get(
+        f"/users/{alice_id}", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
 def test_update_user(client, seeded_users):
-    alice_id = seeded_users["alice"].id
+    alice_id = seeded_users["alice"]
     response = client.put(
         f"/users/{alice_id}",
         json={
@@ -156,32 +445,58 @@ def test_update_user(client, seeded_users):
         assert stored.linkedin_url == "https://linkedin.com/in/alice"
 
 
-def test_update_user_clears_cached_profile(client, seeded_users):
-    alice_id = seeded_users["alice"].id
-    fake_cache = DummyRedis()
-    app = client.application
-    previous_cache_service = app.extensions.get("cache_service")
-    app.extensions["cache_service"] = CacheService(fake_cache, 60)
-    cache_service: CacheService = app.extensions["cache_service"]
+def test_update_user_reports_invalid_list_items(client, seeded_users):
+    response = client.put(
+        f"/users/{seeded_users['alice']}", json={"skills": ["a", 1]}
+    )
+    assert response.status_code == 422
+    details = response.get_json()["error"]["details"]
+    # Marshmallow keys list errors by item index.
+    assert list(details["skills"]) == ["1"]
+
+
+def test_update_user_rejects_malformed_json(client, seeded_users):
+    alice_id = seeded_users["alice"]
+    response = client.put(
+        f"/users/{alice_id}",
+        data="{not json",
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"]["message"] == "missing request body"
+
+
+def test_update_user_not_found(client, seeded_users):
+    response = client.put("/users/999999", json={"title": "Ghost"})
+    assert response.status_code == 404
+
+
+def test_update_user_by_id_without_column_changes(seeded_users):
+    alice_id = seeded_users["alice"]
+    with session_scope() as session:
+        repo = UserRepository(session)
+        user = repo.update_user_by_id(alice_id, {"privacy_settings": None})
+        assert user is not None and user.id == alice_id
+
+
+def test_update_user_clears_cached_profile(client, seeded_users, fake_redis):
+    alice_id = seeded_users["alice"]
+    cache_service: CacheService = client.application.extensions[
+        "cache_service"
+    ]
     cache_key = cache_service.profile_key(alice_id)
     cache_service.set_json(cache_key, {"name": "Old Alice"})
 
-    try:
-        response = client.put(
-            f"/users/{alice_id}",
-            json={"title": "Principal Engineer"},
-        )
-        assert response.status_code == 200
-        assert cache_key not in fake_cache.store
-    finally:
-        if previous_cache_service is not None:
-            app.extensions["cache_service"] = previous_cache_service
-        else:
-            app.extensions.pop("cache_service", None)
+    response = client.put(
+        f"/users/{alice_id}",
+        json={"title": "Principal Engineer"},
+    )
+    assert response.status_code == 200
+    assert cache_key not in fake_redis.store
 
 
 def test_delete_user(client, seeded_users):
-    bob_id = seeded_users["bob"].id
+    bob_id = seeded_users["bob"]
     response = client.delete(f"/users/{bob_id}")
     assert response.status_code == 204
 
@@ -190,13 +505,13 @@ def test_delete_user(client, seeded_users):
         assert repo.get(bob_id) is None
 
 
-def test_upload_photo(client, seeded_users, tmp_path):
-    user_id = seeded_users["carol"].id
-    temp_dir = tempfile.mkdtemp(dir=tmp_path)
-    client.application.config["UPLOAD_FOLDER"] = temp_dir
-    client.application.config["UPLOAD_URL_PREFIX"] = "/media"
+def test_upload_photo(client, seeded_users, upload_folder, monkeypatch):
+    user_id = seeded_users["carol"]
+    monkeypatch.setitem(
+        client.application.config, "UPLOAD_URL_PREFIX", "/media"
+    )
 
-    image_data = io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"0" * 16)
+    image_data = io.BytesIO(PNG_BYTES)
     image_data.name = "avatar.png"
 
     response = client.post(
@@ -209,11 +524,79 @@ def test_upload_photo(client, seeded_users, tmp_path):
     assert payload["user_id"] == user_id
     assert payload["photo_url"].startswith("/media/")
 
-    stored_file = os.path.join(
-        temp_dir,
-        os.path.basename(payload["photo_url"]),
+    stored_file = upload_folder / os.path.basename(payload["photo_url"])
+    assert stored_file.read_bytes() == PNG_BYTES
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(stored_file.stat().st_mode) == 0o666 & ~umask
+
+
+def test_upload_photo_reuses_identical_file(
+    client, seeded_users, upload_folder
+):
+    user_id = seeded_users["carol"]
+    content = PNG_BYTES
+
+    urls = []
+    for _ in range(2):
+        response = client.post(
+            f"/users/{user_id}/photo",
+            data={"photo": (io.BytesIO(content), "avatar.png")},
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 201
+        urls.append(response.get_json()["photo_url"])
+
+    assert urls[0] == urls[1]
+    stored = list(upload_folder.iterdir())
+    assert [path.name for path in stored] == [os.path.basename(urls[0])]
+    assert stored[0].read_bytes() == content
+
+
+def test_upload_photo_for_missing_user_discards_file(
+    client, seeded_users, upload_folder
+):
+
+    image_data = io.BytesIO(PNG_BYTES)
+    response = client.post(
+        "/users/999999/photo",
+        data={"photo": (image_data, "avatar.png")},
+        content_type="multipart/form-data",
     )
-    assert os.path.exists(stored_file)
+    assert response.status_code == 404
+    assert list(upload_folder.iterdir()) == []
+
+
+def test_upload_photo_rejects_oversized_request(
+    client, seeded_users, upload_folder
+):
+    user_id = seeded_users["carol"]
+
+    image_data = io.BytesIO(b"0" * (MAX_REQUEST_SIZE + 1))
+    response = client.post(
+        f"/users/{user_id}/photo",
+        data={"photo": (image_data, "avatar.png")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 422
+    assert response.get_json()["error"]["message"] == "file too large"
+    assert list(upload_folder.iterdir()) == []
+
+
+def test_upload_photo_rejects_oversized_file_while_copying(
+    client, seeded_users, upload_folder
+):
+    user_id = seeded_users["carol"]
+
+    image_data = io.BytesIO(b"0" * (MAX_FILE_SIZE + 1))
+    response = client.post(
+        f"/users/{user_id}/photo",
+        data={"photo": (image_data, "avatar.png")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 422
+    assert response.get_json()["error"]["message"] == "file too large"
+    assert list(upload_folder.iterdir()) == []
 
 
 def test_search_users(client, seeded_users):
@@ -225,38 +608,63 @@ def test_search_users(client, seeded_users):
     assert "alice@example.com" in emails
 
 
-def test_search_users_uses_cache(client, seeded_users, monkeypatch):
-    app = client.application
-    fake_cache = DummyRedis()
-    previous_cache = app.extensions.get("cache_service")
-    app.extensions["cache_service"] = CacheService(fake_cache, 60)
-    try:
-        first = client.get(
-            "/users/search",
-            query_string={"q": "alice", "page": 1, "per_page": 5},
-        )
-        assert first.status_code == 200
-        assert fake_cache.store
+def test_search_users_skips_degenerate_queries(
+    client, seeded_users, monkeypatch
+):
+    def _fail(*_args, **_kwargs):  # pragma: no cover - should not run
+        raise AssertionError("repository executed for degenerate query")
 
-        def _fail(*_args, **_kwargs):  # pragma: no cover - should not run
-            raise AssertionError("repository executed despite cache")
+    monkeypatch.setattr("src.routes.users._execute_user_repo", _fail)
+    for query, searched in (("a", "a"), ("%%%", ""), ("x" * 65, "x" * 65)):
+        response = client.get("/users/search", query_string={"q": query})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["items"] == []
+        assert data["total"] == 0
+        assert data["has_next"] is False
+        assert data["query"] == searched
+
+    response = client.get(
+        "/users/search", query_string={"q": "a", "count": "none"}
+    )
+    assert "total" not in response.get_json()
 
-        monkeypatch.setattr("src.routes.users._execute_user_repo", _fail)
-        second = client.get(
-            "/users/search",
-            query_string={"q": "alice", "page": 1, "per_page": 5},
-        )
-        assert second.status_code == 200
-        assert second.get_json() == first.get_json()
-    finally:
-        if previous_cache is not None:
-            app.extensions["cache_service"] = previous_cache
-        else:
-            app.extensions.pop("cache_service", None)
+
+def test_search_users_strips_disallowed_characters(client, seeded_users):
+    response = client.get(
+        "/users/search", query_string={"q": "(engineer)", "count": "none"}
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["query"] == "engineer"
+    assert "total" not in data
+    assert "alice@example.com" in {item["email"] for item in data["items"]}
+
+
+def test_search_users_uses_cache(
+    client, seeded_users, monkeypatch, fake_redis
+):
+    first = client.get(
+        "/users/search",
+        query_string={"q": "alice", "page": 1, "per_page": 5},
+    )
+    assert first.status_code == 200
+    assert fake_redis.store
+
+    def _fail(*_args, **_kwargs):  # pragma: no cover - should not run
+        raise AssertionError("repository executed despite cache")
+
+    monkeypatch.setattr("src.routes.users._execute_user_repo", _fail)
+    second = client.get(
+        "/users/search",
+        query_string={"q": "alice", "page": 1, "per_page": 5},
+    )
+    assert second.status_code == 200
+    assert second.get_json() == first.get_json()
 
 
 def test_upsert_preferences_endpoint(client, seeded_users):
-    user_id = seeded_users["alice"].id
+    user_id = seeded_users["alice"]
     payload = {"preferences": {"newsletter": "1", "theme": "dark"}}
     response = client.put(f"/users/{user_id}/preferences", json=payload)
     assert response.status_code == 200
@@ -271,7 +679,7 @@ def test_upsert_preferences_endpoint(client, seeded_users):
 
 
 def test_privacy_update_and_tokens(client, seeded_users):
-    user_id = seeded_users["carol"].id
+    user_id = seeded_users["carol"]
     payload = {
         "privacy_settings": {"profile_visibility": "network"},
         "active_tokens": ["alpha", "beta", "alpha", "  gamma  "],
@@ -279,6 +687,7 @@ def test_privacy_update_and_tokens(client, seeded_users):
     response = client.put(f"/users/{user_id}/privacy", json=payload)
     assert response.status_code == 200
     user = response.get_json()["user"]
+    assert set(user) == {"id", "privacy_settings", "active_tokens"}
     assert user["privacy_settings"]["profile_visibility"] == "network"
     encryptor = client.application.extensions["encryptor"]
     expected_tokens = sorted(
@@ -291,7 +700,7 @@ def test_privacy_update_and_tokens(client, seeded_users):
 
 
 def test_activity_logging_and_listing(client, seeded_users):
-    user_id = seeded_users["alice"].id
+    user_id = seeded_users["alice"]
     resp = client.post(
         f"/users/{user_id}/activities",
         json={"activity_type": "login", "score_delta": 5},
@@ -305,6 +714,7 @@ def test_activity_logging_and_listing(client, seeded_users):
     payload = listing.get_json()
     assert payload["total"] == 1
     assert payload["items"][0]["score_delta"] == 5
+    assert client.get("/users/999999/activities").status_code == 404
 
     with session_scope() as session:
         repo = UserRepository(session)
@@ -312,8 +722,29 @@ def test_activity_logging_and_listing(client, seeded_users):
         assert user.engagement_score >= 5
 
 
+def test_activity_score_updates_in_sql(client, seeded_users):
+    user_id = seeded_users["bob"]
+    for delta in (3, -10):
+        resp = client.post(
+            f"/users/{user_id}/activities",
+            json={"activity_type": "vote", "score_delta": delta},
+        )
+        assert resp.status_code == 201
+
+    with session_scope() as session:
+        user = UserRepository(session).get(user_id)
+        # The score never drops below zero.
+        assert user.engagement_score == 0
+        assert [a.score_delta for a in user.activities] == [3, -10]
+
+    missing = client.post(
+        "/users/999999/activities", json={"activity_type": "vote"}
+    )
+    assert missing.status_code == 404
+
+
 def test_session_management_flow(client, seeded_users):
-    user_id = seeded_users["carol"].id
+    user_id = seeded_users["carol"]
     expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
     create = client.post(
         f"/users/{user_id}/sessions",
@@ -352,7 +783,7 @@ def test_session_management_flow(client, seeded_users):
 
 
 def test_gdpr_export_endpoint(client, seeded_users):
-    user_id = seeded_users["alice"].id
+    user_id = seeded_users["alice"]
     resp = client.get(f"/users/{user_id}/export")
     assert resp.status_code == 200
     body = resp.get_json()
@@ -367,7 +798,7 @@ def test_gdpr_export_endpoint(client, seeded_users):
 
 
 def test_gdpr_erase_pseudonymizes_and_logs(client, seeded_users):
-    user_id = seeded_users["bob"].id
+    user_id = seeded_users["bob"]
     with session_scope() as session:
         repo = UserRepository(session)
         user = repo.get(user_id)
@@ -414,8 +845,8 @@ def test_gdpr_erase_pseudonymizes_and_logs(client, seeded_users):
 
 
 def test_connection_crud(client, seeded_users):
-    user_id = seeded_users["alice"].id
-    target_id = seeded_users["bob"].id
+    user_id = seeded_users["alice"]
+    target_id = seeded_users["bob"]
 
     create = client.post(
         f"/users/{user_id}/connections",
@@ -430,9 +861,22 @@ def test_connection_crud(client, seeded_users):
     connection_id = connection["id"]
     assert connection["status"] == "pending"
 
-    list_resp = client.get(f"/users/{user_id}/connections")
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        list_resp = client.get(f"/users/{user_id}/connections")
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
     assert list_resp.status_code == 200
     assert list_resp.get_json()["total"] == 1
+    # One existence check and one page query; no users are loaded.
+    assert len(statements) == 2
 
     update = client.patch(
         f"/users/{user_id}/connections/{connection_id}",
@@ -451,6 +895,40 @@ def test_connection_crud(client, seeded_users):
     assert list_after.get_json()["total"] == 0
 
 
+def test_session_listing_is_paginated(client, seeded_users):
+    user_id = seeded_users["alice"]
+    for index in range(3):
+        response = client.post(
+            f"/users/{user_id}/sessions",
+            json={"session_token": f"token-{index}"},
+        )
+        assert response.status_code == 201
+
+    first = client.get(
+        f"/users/{user_id}/sessions", query_string={"limit": 2}
+    ).get_json()
+    assert len(first["items"]) == 2
+    assert first["total"] == 3
+    assert first["page"] == 1
+
+    second = client.get(
+        f"/users/{user_id}/sessions", query_string={"limit": 2, "page": 2}
+    ).get_json()
+    assert len(second["items"]) == 1
+    assert second["total"] == 3
+
+    beyond = client.get(
+        f"/users/{user_id}/sessions", query_string={"limit": 2, "page": 5}
+    ).get_json()
+    assert beyond["items"] == []
+    assert beyond["total"] == 3
+
+    invalid = client.get(
+        f"/users/{user_id}/sessions", query_string={"limit": 0}
+    )
+    assert invalid.status_code == 400
+
+
 def test_get_user_repository_error(monkeypatch, client):
     def _raise(*_args, **_kwargs):
         raise RepositoryError("database operation failed")
@@ -460,3 +938,51 @@ def test_get_user_repository_error(monkeypatch, client):
     assert response.status_code == 500
     payload = response.get_json()
     assert payload["error"]["message"] == "database operation failed"
+
+
+def test_create_session_expiry_parsing(client, seeded_users):
+    user_id = seeded_users["carol"]
+    zulu = client.post(
+        f"/users/{user_id}/sessions",
+        json={
+            "session_token": "tok-zulu",
+            "expires_at": "2030-01-01T00:00:00Z",
+        },
+    )
+    assert zulu.status_code == 201
+    assert zulu.get_json()["session"]["expires_at"].startswith("2030-01-01")
+
+    numeric = client.post(
+        f"/users/{user_id}/sessions",
+        json={"session_token": "tok-num", "expires_at": 1700000000},
+    )
+    assert numeric.status_code == 422
+
+    garbage = client.post(
+        f"/users/{user_id}/sessions",
+        json={"session_token": "tok-bad", "expires_at": "tomorrow"},
+    )
+    assert garbage.status_code == 422
+    assert garbage.get_json()["error"]["message"] == "invalid datetime format"
+
+
+def test_upsert_preferences_rejects_blank_key(client, seeded_users):
+    user_id = seeded_users["alice"]
+    response = client.put(
+        f"/users/{user_id}/preferences",
+        json={"preferences": {"theme": "dark", "  ": "x"}},
+    )
+    assert response.status_code == 422
+    assert response.get_json()["error"]["message"] == "invalid preference key"
+
+
+def test_upsert_preferences_last_stripped_key_wins(client, seeded_users):
+    user_id = seeded_users["alice"]
+    # A raw body keeps the key order; ``json=`` would sort the keys.
+    response = client.put(
+        f"/users/{user_id}/preferences",
+        data='{"preferences": {"theme": "dark", " theme ": "light"}}',
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    assert response.get_json()["preferences"] == {"theme": "light"}